@@ -0,0 +1,275 @@
+"""
+연도 × 국가, 날짜 × 지표 × 국가 집계 인덱스
+- 데이터 버전마다 한 번만 (합계, 개수) 배열을 만들어 두고, 추세 차트와 지도는 배열 조회로 그립니다.
+- 합계와 개수를 함께 보관하므로 평균 외의 집계(전체 평균, 여러 국가 묶음 등)도 다시 스캔 없이 계산할 수 있습니다.
+- CRW Parquet 은 배치 단위로 읽어 bincount 로 누적하므로 전체 자료를 DataFrame 으로 올리지 않습니다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import perf
+from data_layer import (
+    CACHE_MAX_ENTRIES,
+    COUNTRIES,
+    DATA_VERSION,
+    load_bleaching_frame,
+    load_daily_drivers,
+    load_daily_matrix,
+    open_crw_dataset,
+)
+
+GLOBAL = "전 지구"
+
+# 일별 인덱스에 누적하는 CRW 열 (지표 축의 순서)
+DAILY_METRICS = ("bleaching_index", "ssta", "dhw")
+
+
+def pooled_mean(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """전 지구 값: 국가를 가리지 않은 모든 관측의 평균 (마지막 축인 국가 방향으로 합계 ÷ 개수).
+
+    연도별 추세, 일별 추세, 상관 분석이 모두 이 정의를 씁니다. 관측이 하나도 없으면 NaN.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums.sum(axis=-1) / counts.sum(axis=-1)
+
+
+@dataclass(frozen=True)
+class AggregateIndex:
+    """연도별(행) × 국가별(열) 백화현상 지수 합계/개수."""
+
+    years: np.ndarray
+    countries: tuple[str, ...]
+    sums: np.ndarray
+    counts: np.ndarray
+
+    def __post_init__(self):
+        # 자주 쓰는 파생 배열은 한 번만 계산해 둡니다 (frozen 이라 object.__setattr__ 사용).
+        # 여러 세션이 공유하므로 읽기 전용으로 둡니다.
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sums / self.counts
+        global_mean = pooled_mean(self.sums, self.counts)
+        mean.flags.writeable = False
+        global_mean.flags.writeable = False
+        object.__setattr__(self, "_mean", mean)
+        object.__setattr__(self, "_global_mean", global_mean)
+        object.__setattr__(self, "_columns", {c: i for i, c in enumerate(self.countries)})
+        object.__setattr__(self, "_year_ends", pd.to_datetime([f"{y}-12-31" for y in self.years]))
+
+    @property
+    def first_year(self) -> int:
+        return int(self.years[0]) if len(self.years) else 0
+
+    def mean(self) -> np.ndarray:
+        """연도 × 국가 평균 (관측이 없으면 NaN). 미리 계산한 읽기 전용 배열입니다."""
+        return self._mean
+
+    def global_mean(self) -> np.ndarray:
+        """연도별 전체 관측 평균 (읽기 전용)."""
+        return self._global_mean
+
+    def column(self, country: str) -> int | None:
+        """mean() 에서 해당 국가의 열 번호. 자료에 없는 국가면 None."""
+        return self._columns.get(country)
+
+    def year_means(self, year: int) -> np.ndarray:
+        """해당 연도의 국가별 평균 (countries 순서). 연도가 범위 밖이면 모두 NaN."""
+        row = year - self.first_year
+        if not 0 <= row < len(self.years):
+            return np.full(len(self.countries), np.nan)
+        return self._mean[row]
+
+    def trend(self, country: str) -> pd.DataFrame:
+        """추세 차트용 (날짜, 백화현상지수). 날짜는 연말 날짜입니다."""
+        if country == GLOBAL:
+            values = self._global_mean
+        else:
+            column = self.column(country)
+            values = self._mean[:, column] if column is not None else np.full(len(self.years), np.nan)
+        frame = pd.DataFrame({"날짜": self._year_ends, "백화현상지수": values})
+        return frame[frame["백화현상지수"].notna()]
+
+    def year_frame(self, year: int) -> pd.DataFrame:
+        """지도용 (나라, 백화현상지수). 해당 연도가 없으면 빈 DataFrame."""
+        row = year - self.first_year
+        if not 0 <= row < len(self.years):
+            return pd.DataFrame({"나라": [], "백화현상지수": []})
+        frame = pd.DataFrame({"나라": self.countries, "백화현상지수": self._mean[row]})
+        return frame[frame["백화현상지수"].notna()]
+
+
+class _Accumulator:
+    """(연도, 국가, 값) 묶음을 받아 합계/개수 배열에 누적합니다."""
+
+    def __init__(self, countries: list[str]):
+        self.countries = list(countries)
+        self.codes = {c: i for i, c in enumerate(self.countries)}
+        self.first_year = None
+        self.sums = np.zeros((0, len(self.countries)))
+        self.counts = np.zeros((0, len(self.countries)), dtype=np.int64)
+
+    def _grow(self, min_year: int, max_year: int, n_countries: int) -> None:
+        first = min_year if self.first_year is None else min(self.first_year, min_year)
+        last = max_year if self.first_year is None else max(self.first_year + len(self.sums) - 1, max_year)
+        shape = (last - first + 1, n_countries)
+        if self.first_year == first and self.sums.shape == shape:
+            return
+        sums, counts = np.zeros(shape), np.zeros(shape, dtype=np.int64)
+        if self.first_year is not None:
+            offset = self.first_year - first
+            rows, cols = self.sums.shape
+            sums[offset:offset + rows, :cols] = self.sums
+            counts[offset:offset + rows, :cols] = self.counts
+        self.first_year, self.sums, self.counts = first, sums, counts
+
+    def add(self, years: np.ndarray, countries: np.ndarray, values: np.ndarray) -> None:
+        perf.count("rows.aggregate_index", len(values))
+        valid = ~np.isnan(values)
+        years, countries, values = years[valid], countries[valid], values[valid]
+        if len(values) == 0:
+            return
+        uniques, inverse = np.unique(countries, return_inverse=True)
+        for name in uniques:
+            self.codes.setdefault(str(name), len(self.codes))
+        self.countries = list(self.codes)
+        codes = np.array([self.codes[str(name)] for name in uniques])[inverse]
+
+        self._grow(int(years.min()), int(years.max()), len(self.countries))
+        n_countries = len(self.countries)
+        flat = (years - self.first_year) * n_countries + codes
+        size = self.sums.size
+        self.sums += np.bincount(flat, weights=values, minlength=size).reshape(self.sums.shape)
+        self.counts += np.bincount(flat, minlength=size).reshape(self.counts.shape)
+
+    def finish(self) -> AggregateIndex:
+        years = np.arange(self.first_year or 0, (self.first_year or 0) + len(self.sums))
+        return AggregateIndex(years, tuple(self.countries), self.sums, self.counts)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_aggregate_index(version: str) -> AggregateIndex:
+    """데이터 버전별 집계 인덱스. 버전이 같으면 모든 세션이 같은 인덱스를 공유합니다."""
+    perf.cache_miss("aggregate_index")
+    if version == DATA_VERSION:
+        df = load_bleaching_frame()
+        acc = _Accumulator(COUNTRIES)
+        acc.add(
+            df["날짜"].dt.year.to_numpy(),
+            df["나라"].to_numpy(),
+            df["백화현상지수"].to_numpy(dtype=float),
+        )
+        return acc.finish()
+
+    # CRW Parquet: 배치 단위로 읽어 누적하므로 전체 자료를 메모리에 올리지 않습니다.
+    acc = _Accumulator([c for c in COUNTRIES if c != GLOBAL])
+    dataset = open_crw_dataset(version)
+    for batch in dataset.to_batches(columns=["year", "country", "bleaching_index"]):
+        acc.add(
+            batch.column("year").to_numpy().astype(np.int64),
+            batch.column("country").to_numpy(zero_copy_only=False),
+            batch.column("bleaching_index").to_numpy(zero_copy_only=False).astype(float),
+        )
+    return acc.finish()
+
+
+@dataclass(frozen=True)
+class DailyIndex:
+    """날짜(행) × 지표(DAILY_METRICS) × 국가별 일별 합계/개수."""
+
+    days: np.ndarray  # datetime64[ns], 빠진 날 없이 하루 간격
+    countries: tuple[str, ...]
+    sums: np.ndarray
+    counts: np.ndarray
+
+    def __post_init__(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sums / self.counts
+        global_mean = pooled_mean(self.sums, self.counts)
+        mean.flags.writeable = False
+        global_mean.flags.writeable = False
+        object.__setattr__(self, "_mean", mean)
+        object.__setattr__(self, "_global_mean", global_mean)
+        object.__setattr__(self, "_columns", {c: i for i, c in enumerate(self.countries)})
+
+    def series(self, metric: str, country: str) -> np.ndarray:
+        """국가(또는 전 지구)의 일별 평균 (읽기 전용). 관측이 없는 날은 NaN."""
+        j = DAILY_METRICS.index(metric)
+        if country == GLOBAL:
+            return self._global_mean[:, j]
+        column = self._columns.get(country)
+        return self._mean[:, j, column] if column is not None else np.full(len(self.days), np.nan)
+
+
+class _DailyAccumulator:
+    """CRW 배치(날짜, 국가, 지표들)를 받아 날짜 × 지표 × 국가 합계/개수 배열에 누적합니다."""
+
+    def __init__(self, countries: list[str]):
+        self.codes = {c: i for i, c in enumerate(countries)}
+        self.first_day = None  # 1970-01-01 부터의 일수
+        self.sums = np.zeros((0, len(DAILY_METRICS), len(self.codes)))
+        self.counts = np.zeros_like(self.sums)
+
+    def _grow(self, lo: int, hi: int) -> None:
+        first = lo if self.first_day is None else min(self.first_day, lo)
+        stop = hi + 1 if self.first_day is None else max(self.first_day + len(self.sums), hi + 1)
+        shape = (stop - first, len(DAILY_METRICS), len(self.codes))
+        if self.first_day == first and self.sums.shape == shape:
+            return
+        sums, counts = np.zeros(shape), np.zeros(shape)
+        if self.first_day is not None:
+            offset = self.first_day - first
+            rows, _, cols = self.sums.shape
+            sums[offset:offset + rows, :, :cols] = self.sums
+            counts[offset:offset + rows, :, :cols] = self.counts
+        self.first_day, self.sums, self.counts = first, sums, counts
+
+    def add(self, batch) -> None:
+        perf.count("rows.daily_index", batch.num_rows)
+        if batch.num_rows == 0:
+            return
+        day = batch.column("date").to_numpy(zero_copy_only=False).astype("datetime64[D]").astype(np.int64)
+        # 국가 열은 사전 인코딩해서 (보통 한 종류뿐인) 고유 이름만 파이썬으로 옮깁니다.
+        country = batch.column("country").dictionary_encode()
+        names = country.dictionary.to_pylist()
+        for name in names:
+            self.codes.setdefault(name, len(self.codes))
+        lookup = np.array([self.codes[name] for name in names], dtype=np.int64)
+        code = lookup[country.indices.to_numpy(zero_copy_only=False)]
+
+        # 배치(연도 파티션)가 걸친 날짜 구간만 bincount 로 더합니다.
+        lo, hi = int(day.min()), int(day.max())
+        self._grow(lo, hi)
+        n_countries = len(self.codes)
+        rows = slice(lo - self.first_day, hi - self.first_day + 1)
+        flat = (day - lo) * n_countries + code
+        size = (hi - lo + 1) * n_countries
+        for j, name in enumerate(DAILY_METRICS):
+            values = batch.column(name).to_numpy(zero_copy_only=False).astype(np.float64)
+            valid = ~np.isnan(values)
+            self.sums[rows, j] += np.bincount(flat[valid], weights=values[valid], minlength=size).reshape(-1, n_countries)
+            self.counts[rows, j] += np.bincount(flat[valid], minlength=size).reshape(-1, n_countries)
+
+    def finish(self) -> DailyIndex:
+        first = self.first_day or 0
+        days = (np.datetime64(0, "D") + np.arange(first, first + len(self.sums))).astype("datetime64[ns]")
+        return DailyIndex(days, tuple(self.codes), self.sums, self.counts)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_daily_index(version: str) -> DailyIndex:
+    """데이터 버전별 일별 인덱스. 일별 추세와 상관 분석이 모두 이 인덱스에서 국가(또는 전 지구) 시계열을 꺼냅니다."""
+    perf.cache_miss("daily_index")
+    if version == DATA_VERSION:
+        days, values = load_daily_matrix()
+        ssta, dhw = load_daily_drivers()
+        sums = np.stack([values, ssta, dhw], axis=1).astype(np.float64)
+        # 예시 자료는 날짜·국가마다 값이 하나씩(관측 지점 평균) 있으므로 개수는 모두 1 입니다.
+        return DailyIndex(days.to_numpy(), tuple(COUNTRIES), sums, np.ones_like(sums))
+
+    acc = _DailyAccumulator([c for c in COUNTRIES if c != GLOBAL])
+    for batch in open_crw_dataset(version).to_batches(columns=["date", "country", *DAILY_METRICS]):
+        acc.add(batch)
+    return acc.finish()
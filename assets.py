@@ -0,0 +1,142 @@
+"""
+퀴즈 이미지 자산 캐시
+- 원본 이미지를 한 번 내려받아 콘텐츠 해시 파일명으로 static/quiz 에 저장하고, 썸네일/본문용 크기를 미리 만듭니다.
+- 화면에는 /app/static/quiz/... URL 만 전달되므로 재실행마다 이미지 바이트를 다시 보내지 않습니다.
+- 사본이 없는 이미지는 화면 실행 중에 내려받지 않습니다. 원본 URL 을 그대로 쓰고 백그라운드 스레드에서
+  한 번만 가져오며, 요청 하나는 연결부터 본문까지 통틀어 FETCH_TIMEOUT 초 안에 끝납니다.
+  파일명이 내용 해시라 URL 이 바뀌지 않는 한 내용도 바뀌지 않습니다. 앞단 프록시/CDN 에서는
+  /app/static/quiz/ 에 "Cache-Control: public, max-age=31536000, immutable" 을 붙이면 됩니다.
+
+사용 예 (배포 전에 모든 퀴즈 이미지를 미리 준비):
+    $ python assets.py
+"""
+
+import hashlib
+import io
+import json
+import pathlib
+import threading
+import time
+
+from PIL import Image
+
+from news_preview import http_get
+
+STATIC_DIR = pathlib.Path(__file__).parent / "static"
+QUIZ_ASSET_DIR = STATIC_DIR / "quiz"
+MANIFEST_PATH = QUIZ_ASSET_DIR / "manifest.json"
+STATIC_URL_PREFIX = "/app/static/quiz"
+
+# 크기 이름 → 최대 (가로, 세로). 비율은 유지합니다.
+ASSET_SIZES = {
+    "thumb": (240, 240),
+    "display": (960, 960),
+}
+
+FETCH_TIMEOUT = 10                 # 요청 하나(연결~본문)의 전체 제한 시간
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+USER_AGENT = "Mozilla/5.0 (compatible; coral-dashboard-assets/1.0)"
+
+# 가져오기에 실패한 원본은 이 시간 동안 다시 시도하지 않고 원본 URL 을 그대로 씁니다.
+RETRY_AFTER = 10 * 60
+
+_manifest: dict[str, str] | None = None
+_manifest_lock = threading.Lock()
+_failed_at: dict[str, float] = {}
+_importing: set[str] = set()
+_import_lock = threading.Lock()
+
+
+def _read_source(source: str) -> bytes:
+    if source.startswith(("http://", "https://")):
+        raw, _ = http_get(source, MAX_IMAGE_BYTES, timeout=FETCH_TIMEOUT, user_agent=USER_AGENT)
+        return raw
+    return pathlib.Path(source).read_bytes()
+
+
+def _load_manifest() -> dict[str, str]:
+    global _manifest
+    if _manifest is None:
+        try:
+            _manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def import_image(source: str) -> str:
+    """원본(URL 또는 파일 경로)을 읽어 모든 크기의 사본을 만들고 콘텐츠 해시를 반환합니다."""
+    raw = _read_source(source)
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+
+    QUIZ_ASSET_DIR.mkdir(parents=True, exist_ok=True)
+    with Image.open(io.BytesIO(raw)) as image:
+        image = image.convert("RGB")
+        for size_name, max_size in ASSET_SIZES.items():
+            path = QUIZ_ASSET_DIR / f"{digest}-{size_name}.jpg"
+            if path.exists():
+                continue
+            resized = image.copy()
+            resized.thumbnail(max_size)
+            resized.save(path, "JPEG", quality=82, optimize=True, progressive=True)
+
+    with _manifest_lock:
+        manifest = _load_manifest()
+        manifest[source] = digest
+        tmp = MANIFEST_PATH.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(MANIFEST_PATH)
+    return digest
+
+
+def _import_in_background(source: str) -> None:
+    with _import_lock:
+        if source in _importing or time.monotonic() - _failed_at.get(source, -RETRY_AFTER) < RETRY_AFTER:
+            return
+        _importing.add(source)
+
+    def run():
+        try:
+            import_image(source)
+            _failed_at.pop(source, None)
+        except Exception:
+            _failed_at[source] = time.monotonic()
+        finally:
+            with _import_lock:
+                _importing.discard(source)
+
+    name = f"quiz-asset-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]}"
+    threading.Thread(target=run, name=name, daemon=True).start()
+
+
+def is_importing(source: str) -> bool:
+    """백그라운드에서 이 이미지를 가져오는 중인지."""
+    with _import_lock:
+        return source in _importing
+
+
+def asset_url(source: str, size: str = "display") -> str:
+    """화면에 쓸 이미지 URL (네트워크를 기다리지 않음).
+
+    로컬 사본이 없으면 백그라운드에서 만들기 시작하고, 그동안(또는 실패하면) 원본 URL 을 그대로 씁니다.
+    """
+    digest = _load_manifest().get(source)
+    if digest is None or not (QUIZ_ASSET_DIR / f"{digest}-{size}.jpg").exists():
+        _import_in_background(source)
+        return source
+    return f"{STATIC_URL_PREFIX}/{digest}-{size}.jpg"
+
+
+def main() -> None:
+    from quiz_bank import QUIZ
+
+    sources = sorted({q["image"] for q in QUIZ if q["image"]})
+    for source in sources:
+        try:
+            print(f"{import_image(source)}  {source}")
+        except Exception as e:
+            print(f"실패: {source} ({e})")
+
+
+if __name__ == "__main__":
+    main()
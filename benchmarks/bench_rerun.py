@@ -0,0 +1,369 @@
+"""
+재실행 지연/메모리 벤치마크
+- streamlit.testing.v1.AppTest 로 streamlit_app.py 를 브라우저 없이 실행하면서 실제 사용자 조작을 흉내 냅니다.
+  (나라 전체 선택, 1980~2020 날짜 이동, 산호초 지점 지도 확대, 탭 전환, 퀴즈 전체 응답)
+- 조작마다 소요 시간, 그 조작 동안 늘어난 최대 RSS, 직렬화된 화면 요소 크기를 기록해 JSON 으로 저장합니다.
+  (최대 RSS 는 조작 직전에 /proc/self/clear_refs 로 되돌려 조작 하나의 값만 잽니다.)
+- 콜드 스타트를 뺀 조작 순서 전체를 --repeat 번(회차) 되풀이합니다.
+  시간은 이번 실행에서 가장 빠른 회차의 중앙값(wall_ms_best_round_p50)을 기준값의 보통 회차 중앙값
+  (wall_ms_round_p50, 회차별 중앙값의 중앙값)과 비교하며, 회차가 MIN_TIME_ROUNDS 개 이상이고
+  표본이 MIN_TIME_SAMPLES 개 이상인 조작만 비교합니다. 가장 빠른 회차까지 느려져야 실패하므로,
+  다른 프로세스가 잠깐 CPU 를 차지해 몇 회차가 느려진 것만으로는 실패하지 않습니다.
+- 시간 기준값은 고정된 계산(_calibrate)의 소요 시간 비율로 보정해, 다른 기계에서 만든 기준값과도 비교할 수 있게 합니다.
+  이 계산은 회차마다 시작할 때 다시 재고 그 중앙값을 쓰므로, 측정 내내 기계가 바쁘면 기준값도 그만큼 늘어납니다.
+- 저장된 기준값(baseline.json)보다 허용 범위 이상 나빠지면 종료 코드 1 로 실패합니다.
+- --scales 로 예시 데이터(연도별·일별 모두)를 10배~1000배까지 늘릴 수 있으며, 배율마다 별도 프로세스에서 측정합니다.
+
+측정의 한계:
+- AppTest.run() 은 조작마다 스크립트 전체를 다시 실행합니다. @st.fragment 안의 위젯(날짜 이동, 퀴즈 등)을 바꿔도
+  브라우저에서처럼 조각만 다시 실행되지 않으므로, 여기서 잰 시간은 전체 재실행 시간입니다.
+- page_bytes 는 실행이 끝난 뒤 화면 요소 트리 전체의 직렬화 크기입니다. 브라우저로 실제로 보내는 변경분(delta)이 아닙니다.
+- 조각 재실행 시간과 웹소켓으로 보내는 실제 메시지 크기는 benchmarks/cold_start.py 처럼 /_stcore/stream 에 직접 붙어 재야 합니다.
+
+사용 예:
+    $ python benchmarks/bench_rerun.py
+    $ python benchmarks/bench_rerun.py --scales 1 10 100 1000 --output bench_results.json
+    $ python benchmarks/bench_rerun.py --update-baseline
+"""
+
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / "streamlit_app.py"
+BASELINE_PATH = pathlib.Path(__file__).resolve().parent / "baseline.json"
+
+# 기준값 대비 허용 범위. 시간은 실행 환경마다 흔들리므로 넉넉하게 둡니다.
+# 아주 짧은 조작·작은 메모리 증가는 비율만으로는 잡음에 걸리므로 절대 여유도 함께 둡니다.
+# (조작 하나의 RSS 증가는 할당자가 해제된 메모리를 얼마나 재사용하느냐에 따라 수십 MB 씩 흔들립니다.)
+TIME_TOLERANCE = 0.5
+TIME_SLACK_MS = 5.0
+BYTES_TOLERANCE = 0.05
+RSS_TOLERANCE = 0.5
+RSS_SLACK_MB = 32.0
+
+# 시간 비교에 필요한 최소 회차 수와 표본 수
+# (콜드 스타트처럼 한 번뿐인 조작, 회차마다 한 번뿐인 조작, --repeat 1 실행은 시간을 비교하지 않습니다)
+MIN_TIME_ROUNDS = 3
+MIN_TIME_SAMPLES = 10
+DEFAULT_REPEAT = 5
+
+_PROC_STATUS = pathlib.Path("/proc/self/status")
+_PROC_CLEAR_REFS = pathlib.Path("/proc/self/clear_refs")
+
+
+def _proc_status_mb(field: str) -> float:
+    for line in _PROC_STATUS.read_text().splitlines():
+        if line.startswith(field + ":"):
+            return int(line.split()[1]) / 1024
+    raise KeyError(field)
+
+
+def _ru_maxrss_mb() -> float:
+    # 리눅스는 KiB, macOS 는 바이트 단위입니다.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _can_reset_peak_rss() -> bool:
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+        _proc_status_mb("VmHWM")
+    except (OSError, KeyError):
+        return False
+    return True
+
+
+class _RssProbe:
+    """조작 하나 동안 늘어난 최대 RSS(MB).
+
+    리눅스에서는 조작 직전에 최대 RSS(VmHWM)를 현재 RSS 로 되돌려, 조작 중 최댓값 - 조작 전 RSS 를 잽니다.
+    그럴 수 없는 환경에서는 프로세스 최대 RSS(ru_maxrss)의 전후 차이로 대신합니다 (이전 최댓값을 넘은 만큼만 보임).
+    """
+
+    def __init__(self):
+        self.resettable = _can_reset_peak_rss()
+
+    def start(self) -> None:
+        if self.resettable:
+            _PROC_CLEAR_REFS.write_text("5")
+            self.before = _proc_status_mb("VmRSS")
+        else:
+            self.before = _ru_maxrss_mb()
+
+    def growth_mb(self) -> float:
+        peak = _proc_status_mb("VmHWM") if self.resettable else _ru_maxrss_mb()
+        return max(peak - self.before, 0.0)
+
+
+def _calibrate(rounds: int = 9) -> float:
+    """기계 속도 기준: 고정된 numpy·순수 파이썬 계산의 최소 소요 시간(ms). 최솟값은 다른 작업의 간섭을 덜 받습니다."""
+    import numpy as np
+
+    values = np.random.default_rng(0).random(1 << 20)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        np.sort(values)
+        sum(i * i for i in range(300_000))
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def _tree_bytes(at) -> int:
+    """실행이 끝난 뒤 화면 요소 트리 전체의 protobuf 직렬화 크기 합 (브라우저로 보내는 변경분이 아니라 전체 화면 크기)."""
+    total = 0
+    stack = [at.main, at.sidebar]
+    while stack:
+        node = stack.pop()
+        proto = getattr(node, "proto", None)
+        if proto is not None and hasattr(proto, "ByteSize"):
+            total += proto.ByteSize()
+        stack.extend(getattr(node, "children", {}).values())
+    return total
+
+
+class Recorder:
+    def __init__(self, at):
+        self.at = at
+        self.samples: dict[str, list[dict]] = {}
+        self.rss = _RssProbe()
+        # 조작 순서를 몇 번째 되풀이하는 중인지 (start_round 가 바꿉니다)
+        self.round = 0
+        self.calibrations: list[float] = []
+
+    def start_round(self, index: int) -> None:
+        self.round = index
+        self.calibrations.append(_calibrate())
+
+    def run(self, scenario: str, tab: str = "메인") -> None:
+        # AppTest 는 탭 선택 상태를 다음 실행에 넘겨주지 않으므로 매번 지정합니다.
+        self.at.session_state["active_tab"] = tab
+        self.rss.start()
+        start = time.perf_counter()
+        self.at.run()
+        elapsed = time.perf_counter() - start
+        rss_growth = self.rss.growth_mb()
+        if self.at.exception:
+            raise RuntimeError(f"{scenario}: {self.at.exception[0].message}")
+        self._record(scenario, elapsed, rss_growth, _tree_bytes(self.at))
+
+    def call(self, scenario: str, fn, *args) -> None:
+        """화면 실행이 아닌 작업(예: 다운로드 파일 만들기)을 같은 방식으로 잽니다."""
+        self.rss.start()
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        self._record(scenario, elapsed, self.rss.growth_mb(), 0)
+
+    def _record(self, scenario: str, elapsed: float, rss_growth: float, page_bytes: int) -> None:
+        self.samples.setdefault(scenario, []).append({
+            "round": self.round,
+            "wall_ms": elapsed * 1000,
+            "rss_growth_mb": rss_growth,
+            "page_bytes": page_bytes,
+        })
+
+    def summary(self) -> dict:
+        result = {}
+        for scenario, samples in self.samples.items():
+            walls = sorted(s["wall_ms"] for s in samples)
+            rounds: dict[int, list[float]] = {}
+            for s in samples:
+                rounds.setdefault(s["round"], []).append(s["wall_ms"])
+            round_p50s = [statistics.median(r) for r in rounds.values()]
+            result[scenario] = {
+                "count": len(samples),
+                "rounds": len(rounds),
+                "wall_ms_round_p50": round(statistics.median(round_p50s), 2),
+                "wall_ms_best_round_p50": round(min(round_p50s), 2),
+                "wall_ms_p50": round(statistics.median(walls), 2),
+                "wall_ms_p95": round(walls[min(len(walls) - 1, int(len(walls) * 0.95))], 2),
+                "wall_ms_max": round(walls[-1], 2),
+                "rss_growth_mb_max": round(max(s["rss_growth_mb"] for s in samples), 2),
+                "page_bytes_max": max(s["page_bytes"] for s in samples),
+            }
+        result["_machine"] = {
+            "calibration_ms": round(statistics.median(self.calibrations or [_calibrate()]), 2),
+            "process_peak_rss_mb": round(_ru_maxrss_mb(), 2),
+            "rss_per_interaction": self.rss.resettable,
+        }
+        return result
+
+
+def run_scenarios(repeat: int = DEFAULT_REPEAT) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    import export
+    from aggregates import GLOBAL
+    from data_layer import COUNTRIES, END_DATE, START_DATE, data_version
+    from quiz_bank import QUIZ
+    from reef_sites import MAX_ZOOM
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+    rec = Recorder(at)
+    rec.run("cold_start")
+    # 콜드 스타트를 뺀 조작 순서 전체를 되풀이합니다. 첫 회차는 캐시를 채우고, 이후 회차는 캐시를 씁니다.
+    for i in range(repeat):
+        rec.start_round(i)
+        rec.run("warm_start")
+
+        for country in COUNTRIES:
+            at.sidebar.selectbox[0].select(country)
+            rec.run("select_country")
+
+        for year in range(START_DATE.year, END_DATE.year + 1):
+            at.date_input(key="selected_date").set_value(datetime.date(year, 1, 1))
+            rec.run("sweep_date")
+
+        for resolution in ("월별", "일별", "연도별"):
+            at.radio(key="trend_resolution").set_value(resolution)
+            rec.run("trend_resolution")
+
+        at.radio(key="map_level").set_value("산호초 지점")
+        rec.run("site_map")
+        for zoom in range(MAX_ZOOM + 1):
+            at.slider(key="site_zoom").set_value(zoom)
+            rec.run("site_zoom")
+        at.radio(key="map_level").set_value("국가별")
+        rec.run("site_map")
+
+        for tab in ("보고서", "한겨레 뉴스", "플래닛 03 뉴스", "퀴즈", "메인"):
+            rec.run("switch_tab", tab)
+
+        # 이전 회차에서 마지막 문제까지 넘겼으므로 첫 문제로 되돌립니다.
+        at.session_state["quiz_page"] = 0
+        rec.run("switch_tab", "퀴즈")
+        for i, q in enumerate(QUIZ, 1):
+            at.radio(key=f"quiz_answer_{i}").set_value(q["answer"])
+            rec.run("quiz_answer", "퀴즈")
+            if i < len(QUIZ):
+                next(b for b in at.button if b.label.startswith("다음 문제")).click()
+                rec.run("quiz_next", "퀴즈")
+        next(b for b in at.button if b.label == "최종 채점").click()
+        rec.run("quiz_submit", "퀴즈")
+
+        # 다운로드 버튼은 누를 때만 파일을 만들므로 화면 실행과 따로 잽니다 (매번 새로 만들도록 캐시를 비움).
+        shutil.rmtree(export.EXPORT_DIR, ignore_errors=True)
+        rec.call("export_year", export.export_path, data_version(), GLOBAL, END_DATE.year - 1, "CSV", False)
+
+    return rec.summary()
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """기준값보다 허용 범위 이상 나빠진 항목을 설명 문자열로 반환합니다.
+
+    시간은 양쪽 모두 회차가 MIN_TIME_ROUNDS 개, 표본이 MIN_TIME_SAMPLES 개 이상인 조작만, 가장 빠른 회차의 중앙값을
+    기계 속도 비율(calibration_ms)로 보정한 기준값의 보통 회차 중앙값과 비교합니다.
+    """
+    failures = []
+    for scale, scenarios in results.items():
+        expected_scale = baseline.get(scale, {})
+        speed = 1.0
+        machine, expected_machine = scenarios.get("_machine"), expected_scale.get("_machine")
+        if machine and expected_machine:
+            speed = machine["calibration_ms"] / expected_machine["calibration_ms"]
+        for scenario, metrics in scenarios.items():
+            expected = expected_scale.get(scenario)
+            if scenario.startswith("_") or expected is None:
+                continue
+            # (이번 실행 값, 비교한 기준값, 허용 한계)
+            checks = [
+                ("page_bytes_max", "page_bytes_max", expected["page_bytes_max"] * (1 + BYTES_TOLERANCE)),
+                (
+                    "rss_growth_mb_max",
+                    "rss_growth_mb_max",
+                    expected["rss_growth_mb_max"] * (1 + RSS_TOLERANCE) + RSS_SLACK_MB,
+                ),
+            ]
+            rounds, count = min(metrics["rounds"], expected["rounds"]), min(metrics["count"], expected["count"])
+            if rounds >= MIN_TIME_ROUNDS and count >= MIN_TIME_SAMPLES:
+                checks.append((
+                    "wall_ms_best_round_p50",
+                    "wall_ms_round_p50",
+                    expected["wall_ms_round_p50"] * speed * (1 + TIME_TOLERANCE) + TIME_SLACK_MS,
+                ))
+            for metric, reference, limit in checks:
+                if metrics[metric] > limit:
+                    failures.append(
+                        f"x{scale} {scenario}.{metric}: {metrics[metric]:.1f} > {limit:.1f} "
+                        f"(기준 {reference} {expected[reference]:.1f}, 기계 속도 비 {speed:.2f})"
+                    )
+    return failures
+
+
+def _measure_in_subprocess(scale: int, repeat: int) -> dict:
+    env = dict(os.environ, CORAL_DATA_SCALE=str(scale))
+    # 뉴스 미리보기 캐시가 측정에 섞이지 않도록 빈 캐시 디렉터리를 씁니다.
+    env.setdefault("CORAL_CACHE_DIR", tempfile.mkdtemp(prefix="coral-bench-"))
+    output = subprocess.run(
+        [sys.executable, __file__, "--single-scale", "--repeat", str(repeat)],
+        env=env,
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="streamlit_app.py 재실행 벤치마크")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1], help="예시 데이터 배율 (예: 1 10 100 1000)")
+    parser.add_argument("--output", type=pathlib.Path, default=ROOT / "bench_results.json")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="조작 순서 전체를 되풀이할 횟수")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--single-scale", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single_scale:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(run_scenarios(args.repeat)))
+        return 0
+
+    results = {str(scale): _measure_in_subprocess(scale, args.repeat) for scale in args.scales}
+    args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    for scale, scenarios in results.items():
+        machine = scenarios["_machine"]
+        print(
+            f"[x{scale}] 기계 속도 기준 {machine['calibration_ms']:.1f}ms, "
+            f"프로세스 최대 RSS {machine['process_peak_rss_mb']:.1f}MB"
+        )
+        for scenario, m in scenarios.items():
+            if scenario.startswith("_"):
+                continue
+            print(
+                f"  {scenario:<18} n={m['count']:<3} p50={m['wall_ms_p50']:8.1f}ms best={m['wall_ms_best_round_p50']:8.1f}ms "
+                f"p95={m['wall_ms_p95']:8.1f}ms rss+={m['rss_growth_mb_max']:7.1f}MB bytes={m['page_bytes_max']:,}"
+            )
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"기준값을 {args.baseline} 에 저장했습니다.")
+        return 0
+
+    if not args.baseline.exists():
+        print("기준값 파일이 없어 비교를 건너뜁니다. --update-baseline 으로 만들 수 있습니다.")
+        return 0
+    failures = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+    for failure in failures:
+        print("회귀:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+콜드 스타트 (첫 화면까지 걸리는 시간) 측정
+- 매 반복마다 새 `streamlit run` 프로세스를 띄워, 컨테이너가 새로 늘어났을 때와 같은 상태에서 측정합니다.
+- 브라우저 대신 Streamlit 웹소켓(/_stcore/stream)에 직접 붙어 첫 실행을 요청하고, 서버가 보내는 메시지의 도착 시각을 잽니다.
+  · server_ready_ms : 프로세스 시작 → /_stcore/health 응답
+  · first_render_ms : 실행 요청 → 첫 화면 요소(delta) 도착
+  · first_chart_ms  : 실행 요청 → 첫 plotly 차트 도착
+  · script_ms       : 실행 요청 → 스크립트 실행 완료(script_finished)
+  · total_first_render_ms : 프로세스 시작 → 첫 화면 요소 (자동 확장 시 새 인스턴스가 첫 화면을 보내기까지)
+- 같은 프로세스에 두 번째 세션을 붙여, 프로세스 공유 캐시가 채워진 뒤(warm)의 값도 함께 기록합니다.
+
+사용 예:
+    $ python benchmarks/cold_start.py
+    $ python benchmarks/cold_start.py --runs 10 --output cold_start.json
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from websockets.sync.client import connect
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / "streamlit_app.py"
+
+SERVER_TIMEOUT = 60
+SCRIPT_TIMEOUT = 180
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_healthy(port: int, process: subprocess.Popen) -> None:
+    url = f"http://127.0.0.1:{port}/_stcore/health"
+    deadline = time.monotonic() + SERVER_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit 프로세스가 종료되었습니다 (코드 {process.returncode})")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{SERVER_TIMEOUT}초 안에 서버가 준비되지 않았습니다")
+
+
+def measure_session(port: int) -> dict:
+    """새 세션 하나로 첫 실행을 요청하고, 메시지 도착 시각(ms)을 기록합니다."""
+    timings = {"first_render_ms": None, "first_chart_ms": None, "script_ms": None}
+    uri = f"ws://127.0.0.1:{port}/_stcore/stream"
+    with connect(uri, subprotocols=["streamlit"], max_size=None, proxy=None) as ws:
+        start = time.perf_counter()
+        ws.send(BackMsg(rerun_script=ClientState(query_string="", page_script_hash="")).SerializeToString())
+        while timings["script_ms"] is None:
+            msg = ForwardMsg()
+            msg.ParseFromString(ws.recv(timeout=SCRIPT_TIMEOUT))
+            elapsed = (time.perf_counter() - start) * 1000
+            kind = msg.WhichOneof("type")
+            if kind == "delta":
+                if timings["first_render_ms"] is None:
+                    timings["first_render_ms"] = elapsed
+                element = msg.delta.new_element.WhichOneof("type") if msg.delta.HasField("new_element") else None
+                if element == "plotly_chart" and timings["first_chart_ms"] is None:
+                    timings["first_chart_ms"] = elapsed
+            elif kind == "script_finished":
+                timings["script_ms"] = elapsed
+    return timings
+
+
+def measure_process() -> dict:
+    """streamlit 서버를 새로 띄워 콜드 세션과 웜 세션을 차례로 잽니다."""
+    port = _free_port()
+    env = dict(os.environ)
+    # 뉴스 미리보기·내보내기 캐시가 측정에 섞이지 않도록 빈 캐시 디렉터리를 씁니다.
+    env.setdefault("CORAL_CACHE_DIR", tempfile.mkdtemp(prefix="coral-cold-"))
+    command = [
+        sys.executable, "-m", "streamlit", "run", str(APP_PATH),
+        "--server.headless", "true",
+        "--server.port", str(port),
+        "--server.address", "127.0.0.1",
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+    ]
+    spawned = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        _wait_until_healthy(port, process)
+        server_ready_ms = (time.perf_counter() - spawned) * 1000
+        cold = measure_session(port)
+        warm = measure_session(port)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {
+        "server_ready_ms": server_ready_ms,
+        "total_first_render_ms": server_ready_ms + cold["first_render_ms"],
+        "cold": cold,
+        "warm": warm,
+    }
+
+
+def summarize(runs: list[dict]) -> dict:
+    def stats(values: list[float | None]) -> dict:
+        values = sorted(v for v in values if v is not None)
+        if not values:
+            return {}
+        return {"p50": round(statistics.median(values), 1), "max": round(values[-1], 1)}
+
+    summary = {
+        "runs": len(runs),
+        "server_ready_ms": stats([r["server_ready_ms"] for r in runs]),
+        "total_first_render_ms": stats([r["total_first_render_ms"] for r in runs]),
+    }
+    for session in ("cold", "warm"):
+        summary[session] = {
+            metric: stats([r[session][metric] for r in runs])
+            for metric in ("first_render_ms", "first_chart_ms", "script_ms")
+        }
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="streamlit_app.py 콜드 스타트 측정")
+    parser.add_argument("--runs", type=int, default=5, help="새 프로세스를 띄워 측정할 횟수")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="요약을 JSON 으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for i in range(args.runs):
+        run = measure_process()
+        runs.append(run)
+        print(
+            f"[{i + 1}/{args.runs}] 서버 준비 {run['server_ready_ms']:7.1f}ms  "
+            f"첫 화면 {run['cold']['first_render_ms']:7.1f}ms  "
+            f"첫 차트 {run['cold']['first_chart_ms'] or float('nan'):7.1f}ms  "
+            f"실행 완료 {run['cold']['script_ms']:7.1f}ms  "
+            f"(웜 세션 실행 완료 {run['warm']['script_ms']:7.1f}ms)"
+        )
+
+    summary = summarize(runs)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.output is not None:
+        args.output.write_text(json.dumps({"summary": summary, "runs": runs}, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""
+앱 전체에서 쓰는 가벼운 상수
+- 첫 화면(제목, 사이드바)을 그리는 데 필요한 값만 둡니다. 무거운 라이브러리를 불러오지 않으므로
+  streamlit_app.py 가 pandas/numpy/pyarrow 없이도 곧바로 사용할 수 있습니다.
+- data_layer.py 가 같은 이름으로 다시 내보내므로 기존 `from data_layer import COUNTRIES` 도 그대로 동작합니다.
+"""
+
+import datetime
+
+START_DATE = datetime.date(1980, 1, 1)
+END_DATE = datetime.date(2020, 8, 31)
+# 지도 날짜 선택의 처음 값
+DEFAULT_DATE = datetime.date(2000, 1, 1)
+
+COUNTRIES = ["전 지구", "대한민국", "호주", "인도네시아", "필리핀", "일본", "몰디브", "미국 하와이"]
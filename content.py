@@ -0,0 +1,138 @@
+"""
+정적 보고서/안내 문구
+- 탭마다 다시 만들 필요가 없는 긴 HTML·마크다운을 모듈 상수로 모아 둡니다.
+- 들여쓰기 정리(st.markdown 이 매번 하는 dedent/strip)를 불러올 때 한 번만 해 두므로,
+  프로세스당 한 번 만들어진 문자열을 모든 세션과 재실행이 그대로 씁니다.
+"""
+
+import textwrap
+
+
+def _block(text: str) -> str:
+    return textwrap.dedent(text).strip()
+
+
+# 페이지 제목과 소개 문단
+TITLE_HTML = "<h1 style='color:black;'>🌊 산호초 백화현상 & 해수 온도 대시보드</h1>"
+INTRO_HTML = "<p style='color:black; font-size: 16px; font-weight: bold;'>😍 해수온이 올라가면 산호가 조말루치라는 조류를 잃어 ‘백화 현상’이 일어납니다. 산호는 색을 잃고 영양도 제대로 얻지 못해 약해집니다. 지구 온난화, 이상 기후, 오염 등이 원인이며, 백화가 오래 지속되면 산호와 그곳에 사는 해양 생물들 모두 위험해집니다. ❤️‍🩹</p>"
+
+# 메인 탭 하단: 종합 보고서, 해결 방안, 연구의 한계, 맺음말
+MAIN_REPORT_HTML = _block("""
+        ### 📚 종합 보고서: 백화된 산호초와 지구 온난화
+        
+        <div style="font-size: medium;">
+        <br>
+        <b>📖 데이터 출처 및 참고 자료</b>
+        <ul>
+            <li>공식 해수면 데이터: NOAA Sea Level Change Portal / Allen Coral Atlas</li>
+            <li>뉴스 출처:
+                <ul>
+                    <li>한겨레 뉴스 '산호가 보내는 SOS' 기사</li>
+                    <li>플래닛 03 뉴스 '식량위기, 바다가 보내는 경고' 기사</li>
+                </ul>
+            </li>
+        </ul>
+
+        <b>🌍 주요 연구 결과 및 시사점</b>
+        <ul>
+            <li><b>주요 연구 결과</b><br>
+                <ul>
+                    <li>해수온이 평년보다 1~2℃ 이상 상승하면 산호초 백화 현상 발생</li>
+                    <li>해수온과 백화 현상 간의 상관관계 확인</li>
+                    <li>해수온 상승이 산호 생태계 붕괴의 핵심 원인임을 보여줌</li>
+                    <li>백화 현상이 지속되면 산호는 죽게됨</li>
+                </ul>
+            </li>
+            <li><b>해양 생태계에 미치는 영향</b><br>
+                <ul>
+                    <li>전 세계 약 25%의 해양 생물의 서식지 파괴</li>
+                    <li>생물 다양성 위협</li>
+                    <li>어업 자원 감소, 관광 산업 위축, 해안 침식등의 사회경제적 손실</li>
+                </ul>
+            </li>
+            <li><b>시사점 및 실천 방안</b><br>
+                <ul>
+                    <li>온실가스 배출량 줄여 기후 변화 늦추기</li>
+                    <li>해양 오염도 원인이 되므로 이에 대한 노력 필요</li>
+                    <li>사람들의 행동 변화를 이끌어 내야함</li>
+                </ul>
+            </li>
+        </ul>
+        </div>
+        """)
+
+SOLUTIONS_TITLE_HTML = "<br><b>💡 해결 방안 및 실천 과제</b>"
+SOLUTIONS_HTML = _block("""
+        <div style="font-size: medium;">
+            <b>1. 온실가스 배출량 줄이기</b>
+            <ul>
+                <li>자가용 보다 대중교통 이용하기</li>
+                <li>자전거 타고 이동하기</li>
+                <li>불을 끄거나 어댑터를 뽑아 안 쓰는 전기 절약하기</li>
+                <li>에너지 소비 효율 좋은 제품 사용하기</li>
+            </ul>
+            <b>2. 환경 개선하기</b>
+            <ul>
+                <li>플라스틱 사용 줄이기</li>
+                <li>해양 봉사활동 (쓰레기 줍기)</li>
+            </ul>
+            <b>3. 인식 개선</b>
+            <ul>
+                <li>환경 교육과 캠페인</li>
+                <li>SNS, TV 광고 등을 통한 문제 알리기</li>
+            </ul>
+        </div>
+        """)
+
+LIMITS_HTML = _block("""
+    ---
+    <br>
+    <p style='color:black; font-weight:bold;'>⚠️ 연구의 한계 및 주의사항</p>
+    <p>이 대시보드의 일부 데이터는 교육 및 시각화 목적의 시뮬레이션을 포함하고 있습니다. 실제 학술 연구나 정책 결정에는 다음의 공식 데이터를 활용하시기 바랍니다:</p>
+    <br>
+    <ul>
+        <li><a href="https://allencoralatlas.org/atlas/#4.55/-15.4730/149.1687" target="_blank">Allen Coral Atlas</a></li>
+        <li><a href="https://kosis.kr/index/index.do" target="_blank">국가통계포털(KOSIS)</a></li>
+    </ul>
+    """)
+
+CLOSING_HTML = _block("""
+    <div style="text-align: center; font-size: large; font-weight: bold;">
+    <br>
+    <p>우리는 마치 끓는 물 속의 개구리입니다. 서서히 변화하는 위험을 인지하지 못하고 현실에 안주하고 있으니 말입니다. 지금 이 시간에도 지구 온난화로 인해 바다 속부터 변화가 일어나고 있습니다. 하지만 정해진 결말이라 단정짓고 포기할 이유는 없습니다. 사소한 행동을 모으고, 쌓아서 다른 미래를 만들어갈 가능성을 가진 것이 사람이니까요. 그러니 지금부터라도 하나씩 도전해보는건 어떨까요?</p>
+    </div>
+    """)
+
+# '보고서' 탭 본문
+REPORT_MARKDOWN = _block("""
+지구 온난화로 인한 해수온 상승은 생태계 전반에 심각한 영향을 미치고 있으며, 그중에서도 산호초 백화 현상은 가장 대표적이고 우려되는 문제로 지적되고 있습니다. 산호초는 해양 생물의 약 25%가 서식하는 중요한 생태계로서, 생물 다양성과 생산성을 유지하는 핵심적 역할을 수행합니다. 그러나 해수온이 일정 수준 이상으로 상승하면 산호의 색소가 소실되고, 장기적으로는 산호 사멸로 이어지는 백화 현상이 발생합니다.
+
+이러한 산호초의 붕괴는 어업 자원의 감소, 연안 지역의 해양 관광 산업 위축, 해안 방파 효과 상실 등 다양한 사회/경제적 피해를 초래할 수 있습니다. 특히 전 지구적으로 산호초가 빠른 속도로 감소하고 있다는 점은 인류의 지속 가능한 발전에도 직접적인 위협으로 작용합니다. 따라서 단순히 해수온 상승이라는 단일 요인에 그치지 않고, 해양 산성화, 수질 오염, 빛과 영양염류 조건 등 다양한 환경적 요인이 복합적으로 작용할 수 있음을 고려해야 합니다. 이에 본 보고서는 해수온 상승으로 인한 산호초 백화 현상의 원인을 체계적으로 탐구하고, 이를 통해 효과적인 보존 및 관리 방안을 마련하는 데 기초 자료를 제공하고자 합니다.
+
+---
+
+### 해수온 상승과 산호초 백화 현상 간의 상관관계
+
+미국해양대기청(NOAA)의 자료에 따르면, 열대 태평양, 인도양, 카리브 해역 등 주요 산호초 분포 지역에서 해수면 온도가 꾸준히 상승하고 있으며, 특정 시기에는 급격한 고온 현상이 관측되었습니다. 이러한 변화는 대규모 백화 사건과 밀접하게 연결되는데, 실제로 1998년과 2016년에 발생한 전 지구적 백화 현상은 평균 해수온이 평년보다 1~2℃ 높게 유지된 시기와 일치합니다. 이는 해수온 변화 추이가 산호초 백화 현상의 발생 시기와 강도를 설명하는 중요한 지표임을 보여줍니다. 더 나아가 자료 분석 결과, 해수온 상승과 산호초 백화 현상 사이에는 뚜렷한 상관관계가 확인됩니다. 해수온이 임계 수준(약 30℃ 전후)을 초과하거나 평년 대비 1℃ 이상의 고온이 일정 기간 지속될 경우, 산호는 공생조류를 방출하며 급격히 백화됩니다. NOAA 지도의 시각적 증거 역시 이를 뒷받침하는데, 해수온이 높은 지역일수록 산호초의 백화 피해가 집중되는 양상이 뚜렷하게 나타났습니다. 따라서 해수온 상승은 단순한 기후 지표를 넘어, 산호 생태계 붕괴를 직접적으로 설명하는 핵심 요인으로 이해할 수 있습니다.
+
+바다의 온도가 상승할수록 산호초의 백화현상도 빠르게 진행됩니다. 밑은 2016년 부터 2017년까지 1년 동안의 산호초 변화 현상입니다.
+
+그렇다면 바다 온도와 산호초는 실제로 어떤 관련이 있을까요? 결론부터 말하자면, 밀접한 연관이 있습니다. 산호초는 산호충의 석회질 외골격이 오랜 세월 쌓여 형성된 암초로, 전 세계 해양 생물의 약 25%가 서식하는 중요한 생태계입니다. 겉보기에 식물처럼 보이지만 실제로는 촉수를 이용해 먹이를 잡는 동물입니다. 산호는 체내에 공생 조류(조류의 일종인 ‘조류성 미세조류, 조산소를 가지고 있는데, 이 미세조류가 광합성을 통해 산호에게 에너지를 공급합니다. 하지만 바다의 수온이 평소보다 1~2℃ 이상 오르면, 산호는 스트레스를 받아 이 공생 조류를 몸 밖으로 내쫓게 됩니다. 그 결과 산호는 에너지원과 색을 잃어 흰색으로 변하는데, 이것이 바로 산호초 백화현상입니다. 이 현상이 중요한 이유는 단순히 산호의 죽음 때문만이 아닙니다. 산호초는 바다 생태계의 ‘집’이자 ‘어머니’라 불릴 만큼 수많은 해양 생물이 의존하는 터전이기 때문입니다. 작은 물고기들은 산호초를 은신처로 삼고, 갑각류와 말미잘 같은 무척추동물도 산호에 붙어 살아갑니다. 실제로 연구에 따르면, 건강한 산호초는 해양 생물 다양성을 유지하는 핵심 기반이며, 인간에게도 어업과 해안 보호(방파제 역할), 관광 자원을 제공합니다. 하지만 백화현상이 심해지면 산호는 회복하지 못하고 죽게 됩니다. 산호가 사라지면 해양 생물들의 서식지가 붕괴되고, 이는 곧 생태계 균형의 붕괴로 이어집니다. 예를 들어 2016년 호주 그레이트 배리어 리프에서는 해수 온도 상승으로 전체 산호초의 약 30% 이상이 백화되었으며, 일부 지역은 사실상 회복 불가능한 상태에 이르렀습니다. 즉, 산호초 백화현상은 단순히 바닷속 풍경이 사라지는 문제가 아니라, 지구 해양 생태계 전체의 위기와 직결된 현상이라 할 수 있습니다.
+
+---
+
+### 우리의 실천 방안
+
+우리는 산호초 백화현상이 줄어들 수 있도록 노력해야 합니다. 적어도 이 상황이 악화되지 않도록 노력 해야 합니다. 그렇다면 어떤 실천 방법을 실천할 수 있을까요?
+
+<ul style="list-style-type:none;">
+    <li><b>온실가스 배출량 줄이기</b>: 자가용보다 대중교통 이용하기, 자전거 타고 이동하기, 안 쓰는 전기 절약하기, 에너지 효율 좋은 제품 사용하기.</li>
+    <li><b>플라스틱 사용 줄이기</b>: 바다 쓰레기의 약 70%가 플라스틱입니다. 플라스틱 사용을 줄이거나 해양 봉사활동을 통해 쓰레기 유입을 줄이는 것도 좋은 방법입니다.</li>
+    <li><b>환경 교육과 캠페인</b>: 학교에서 진행되는 환경 교육과 캠페인을 좀 더 사실적이고 심각성이 보이게 교육할 필요가 있습니다. 의무적인 교육이 아닌, 실제로 변화를 만들어낼 수 있는 교육이 필요합니다.</li>
+</ul>
+
+이러한 방법들은 모두 실천하기 쉽지만 그만큼 가볍게 생각하게 되는 사소한 방법입니다. 하지만 이 사소한 행동들이 모여 거대한 하나를 만들고 그 거대한 하나가 세상을 바꾸는 것입니다. 사소한 실천을 같이 수업시간에 해보거나 봉사활동으로 참여하는 것도 좋은 방법이라고 생각합니다.
+    """)
+
+# 하단 주의 문구
+FOOTER_CAPTION = "주의: 본 대시보드는 교육/설명 목적입니다. 공식 관측/정책 근거가 필요할 경우 원출처(NOAA, NCEI, NASA 등) 데이터와 원문 레퍼런스를 직접 확인하세요."
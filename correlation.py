@@ -0,0 +1,273 @@
+"""
+해수온 편차/DHW 와 백화현상 지수의 상관 분석
+- 이동(rolling) 상관: 날짜 × (지표, 국가) 누적합 배열 하나로 모든 국가·모든 창 크기의 상관계수를 한 번에 계산합니다.
+- 시차(lag) 상관: 지표를 0~MAX_LAG_DAYS 일 앞당겼을 때의 상관계수를 모든 국가에 대해 계산합니다.
+- 두 계산 모두 합계(개수, Σx, Σy, Σx², Σy², Σxy)만 누적하므로, 새 날짜가 추가되면 그 날짜만 더하면 됩니다.
+  단, 이미 더한 날짜의 값이 바뀌었으면 (국가 추가, 과거 값 수정) 처음부터 다시 만듭니다.
+"""
+
+import datetime
+import hashlib
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from numpy.lib.stride_tricks import sliding_window_view
+
+import perf
+from aggregates import GLOBAL, load_daily_index
+from data_layer import CACHE_MAX_ENTRIES, COUNTRIES, FIGURE_CACHE_ENTRIES
+from timeseries import DOWNSAMPLERS, TREND_CHART_PX
+
+# 화면 이름 → CRW 열 이름
+DRIVERS = {"해수온 편차": "ssta", "DHW": "dhw"}
+ROLLING_WINDOWS = (30, 90, 365)
+MAX_LAG_DAYS = 120
+# 창 안의 유효한 (지표, 지수) 쌍이 이 비율 이상이고 MIN_PAIRS 개 이상일 때만 상관계수를 냅니다.
+# (자료 기간이 짧으면 큰 시차는 쌍이 몇 개뿐이라 r = ±1 같은 값이 나오므로 절대 하한을 둡니다.)
+MIN_VALID_RATIO = 0.8
+MIN_PAIRS = 30
+# 시차 상관을 누적할 때 한 번에 처리할 날짜 수 (임시 배열 크기: 날짜 × 열 × 시차)
+LAG_CHUNK_DAYS = 256
+# 누적합끼리 빼서 생기는 반올림 오차보다 작은 분산은 0 으로 봅니다.
+VARIANCE_EPS = 1e-12
+
+# 누적하는 합계의 순서
+_N, _X, _Y, _XX, _YY, _XY = range(6)
+
+
+def _pair_stats(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """(날짜, K) 모양의 x, y 에서 (날짜, 6, K) 합계 항을 만듭니다. 둘 중 하나라도 NaN 이면 그 쌍은 빠집니다."""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    return np.stack([valid.astype(np.float64), x, y, x * x, y * y, x * y], axis=-2)
+
+
+def _corr(stats: np.ndarray, min_count: float | np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """합계 (..., 6, K) 로 피어슨 상관계수 (..., K) 를 계산합니다.
+
+    scale 은 합계를 구할 때 거친 가장 큰 값(6, K)입니다. 분산이 그 반올림 오차 수준이면
+    (DHW 가 계속 0 인 구간처럼) 값이 사실상 일정한 것으로 보고 NaN 을 냅니다.
+    """
+    n = stats[..., _N, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = stats[..., _XY, :] - stats[..., _X, :] * stats[..., _Y, :] / n
+        var_x = stats[..., _XX, :] - stats[..., _X, :] ** 2 / n
+        var_y = stats[..., _YY, :] - stats[..., _Y, :] ** 2 / n
+        r = cov / np.sqrt(var_x * var_y)
+    ok = (n >= min_count) & (var_x > VARIANCE_EPS * scale[_XX]) & (var_y > VARIANCE_EPS * scale[_YY])
+    return np.where(ok, np.clip(r, -1, 1), np.nan)
+
+
+def _inputs(days: np.ndarray, bleaching: np.ndarray, drivers: dict[str, np.ndarray]) -> list[np.ndarray]:
+    """append() 가 받는 입력을 (날짜, 지수, 지표...) 순서의 연속 배열로 맞춥니다 (지문 계산용)."""
+    return [
+        np.ascontiguousarray(days, dtype="datetime64[ns]"),
+        np.ascontiguousarray(bleaching, dtype=np.float64),
+        *(np.ascontiguousarray(drivers[key], dtype=np.float64) for key in DRIVERS.values()),
+    ]
+
+
+class CorrelationEngine:
+    """일별 (지표, 백화현상 지수) 의 누적 합계를 들고 있는 상관 분석기.
+
+    열은 DRIVERS × countries 순서로 펼쳐져 있습니다 (column() 참고).
+    append() 는 새 날짜의 합계만 더하므로 기존 날짜는 다시 읽지 않습니다.
+    지금까지 더한 입력의 지문(SHA-1)을 함께 누적해 두어, 새 자료의 앞부분이 그대로인지 extends() 로 확인합니다.
+    """
+
+    def __init__(self, countries: list[str], max_lag: int = MAX_LAG_DAYS):
+        self.countries = list(countries)
+        self.max_lag = max_lag
+        self.width = len(DRIVERS) * len(self.countries)
+        self.days = np.empty(0, dtype="datetime64[ns]")
+        # 누적합은 맨 앞에 0 행을 두어 [a, b) 구간 합을 cumsum[b] - cumsum[a] 로 구합니다.
+        self._cumsum = np.zeros((1, 6, self.width))
+        self._lagged = np.zeros((max_lag + 1, 6, self.width))
+        self._tail_x = np.full((max_lag, self.width), np.nan)
+        self._shift = None
+        self._digests = [hashlib.sha1() for _ in range(2 + len(DRIVERS))]
+
+    def column(self, driver: str, country: str) -> int:
+        return list(DRIVERS).index(driver) * len(self.countries) + self.countries.index(country)
+
+    def copy(self) -> "CorrelationEngine":
+        clone = CorrelationEngine(self.countries, self.max_lag)
+        clone.days = self.days
+        clone._cumsum, clone._lagged, clone._tail_x = self._cumsum, self._lagged.copy(), self._tail_x.copy()
+        clone._shift = self._shift
+        clone._digests = [digest.copy() for digest in self._digests]
+        return clone
+
+    def extends(self, days: np.ndarray, bleaching: np.ndarray, drivers: dict[str, np.ndarray]) -> bool:
+        """새 자료가 지금까지 더한 날짜를 값까지 그대로 앞부분에 담고 있는지 (뒤에 날짜만 덧붙였는지)."""
+        known = len(self.days)
+        if len(days) < known:
+            return False
+        arrays = _inputs(days[:known], bleaching[:known], {key: values[:known] for key, values in drivers.items()})
+        return all(
+            digest.digest() == hashlib.sha1(array.tobytes()).digest()
+            for digest, array in zip(self._digests, arrays)
+        )
+
+    def append(self, days: np.ndarray, bleaching: np.ndarray, drivers: dict[str, np.ndarray]) -> None:
+        """새 날짜들을 추가합니다. bleaching 과 drivers 의 각 값은 (날짜, 국가) 배열입니다."""
+        if len(days) == 0:
+            return
+        for digest, array in zip(self._digests, _inputs(days, bleaching, drivers)):
+            digest.update(array.tobytes())
+        x = np.concatenate([np.asarray(drivers[key], dtype=np.float64) for key in DRIVERS.values()], axis=1)
+        y = np.tile(np.asarray(bleaching, dtype=np.float64), len(DRIVERS))
+        if self._shift is None:
+            # 큰 값끼리 빼면서 생기는 자릿수 손실을 줄이려고 첫 구간 평균만큼 옮겨서 누적합니다.
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                shift_x, shift_y = np.nanmean(x, axis=0), np.nanmean(y, axis=0)
+            self._shift = (np.nan_to_num(shift_x), np.nan_to_num(shift_y))
+        x, y = x - self._shift[0], y - self._shift[1]
+        perf.count("rows.correlation_append", len(days))
+
+        stats = _pair_stats(x, y)
+        self._cumsum = np.concatenate([self._cumsum, self._cumsum[-1] + np.cumsum(stats, axis=0)])
+        self._accumulate_lags(x, y)
+        self.days = np.concatenate([self.days, np.asarray(days, dtype="datetime64[ns]")])
+
+    def _accumulate_lags(self, x: np.ndarray, y: np.ndarray) -> None:
+        # 직전 max_lag 일의 지표를 앞에 붙여, 새 날짜 t 마다 x[t - lag] 를 창(window)으로 바로 꺼냅니다.
+        history = np.concatenate([self._tail_x, x])
+        lag = self.max_lag
+        valid_y = ~np.isnan(y)
+        y = np.where(valid_y, y, 0.0)
+        for start in range(0, len(y), LAG_CHUNK_DAYS):
+            stop = min(start + LAG_CHUNK_DAYS, len(y))
+            # windows[j, k, m] = history[start + j + m, k] → m = lag - 시차
+            windows = sliding_window_view(history[start:stop + lag], lag + 1, axis=0)[..., ::-1]
+            valid_x = ~np.isnan(windows)
+            xs = np.where(valid_x, windows, 0.0)
+            my, ys = valid_y[start:stop].astype(np.float64), y[start:stop]
+            # 날짜 축으로 곱해 더하면 (시차, 열) 합계가 바로 나옵니다.
+            mx = valid_x.astype(np.float64)
+            self._lagged[:, _N] += np.einsum("jkl,jk->lk", mx, my)
+            self._lagged[:, _X] += np.einsum("jkl,jk->lk", xs, my)
+            self._lagged[:, _Y] += np.einsum("jkl,jk->lk", mx, ys)
+            self._lagged[:, _XX] += np.einsum("jkl,jk->lk", xs * xs, my)
+            self._lagged[:, _YY] += np.einsum("jkl,jk->lk", mx, ys * ys)
+            self._lagged[:, _XY] += np.einsum("jkl,jk->lk", xs, ys)
+        self._tail_x = history[-lag:] if lag else self._tail_x
+
+    def rolling(self, windows: tuple[int, ...] = ROLLING_WINDOWS) -> np.ndarray:
+        """창 크기별 이동 상관계수 (창, 날짜, 열). 창이 다 차지 않은 앞부분은 NaN."""
+        result = np.full((len(windows), len(self.days), self.width), np.nan)
+        for i, window in enumerate(windows):
+            if window > len(self.days):
+                continue
+            # 날짜 t 에서 끝나는 창의 합계 = cumsum[t + 1] - cumsum[t + 1 - window]
+            stats = self._cumsum[window:] - self._cumsum[:-window]
+            result[i, window - 1:] = _corr(stats, max(window * MIN_VALID_RATIO, MIN_PAIRS), self._cumsum[-1])
+        return result
+
+    def lagged(self) -> np.ndarray:
+        """시차(0..max_lag 일)별 전체 기간 상관계수 (시차, 열). 양수 시차는 지표가 지수보다 앞선다는 뜻입니다."""
+        min_count = np.maximum(MIN_VALID_RATIO * (len(self.days) - np.arange(self.max_lag + 1)), MIN_PAIRS)
+        return _corr(self._lagged, min_count[:, None], self._lagged[0])
+
+
+def _daily_panel(version: str) -> tuple[list[str], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+    """(국가 목록, 날짜, 백화현상 지수, {지표: 값}) — 값은 모두 날짜 × 국가 배열입니다.
+
+    추세 차트와 같은 일별 인덱스에서 꺼내므로, 전 지구 열도 추세 차트와 같은 정의(모든 관측의 평균)입니다.
+    """
+    index = load_daily_index(version)
+    countries = [GLOBAL, *(c for c in COUNTRIES if c != GLOBAL)]
+
+    def panel(metric: str) -> np.ndarray:
+        return np.stack([index.series(metric, country) for country in countries], axis=1)
+
+    return countries, index.days, panel("bleaching_index"), {key: panel(key) for key in DRIVERS.values()}
+
+
+# 가장 최근에 만든 분석기. 새 버전이 기존 날짜는 그대로 두고 뒤에 날짜만 덧붙인 것이면 이어서 누적합니다.
+_latest: CorrelationEngine | None = None
+_latest_lock = threading.Lock()
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_correlation_engine(version: str) -> CorrelationEngine:
+    """데이터 버전별 상관 분석기. 반환된 분석기는 공유되므로 append() 하지 마세요."""
+    global _latest
+    perf.cache_miss("correlation_engine")
+    countries, days, bleaching, drivers = _daily_panel(version)
+
+    with _latest_lock:
+        previous = _latest
+    if previous is not None and previous.countries == countries and previous.extends(days, bleaching, drivers):
+        # 이전 버전이 본 날짜와 값이 모두 그대로이므로 새 날짜만 더합니다.
+        engine, known = previous.copy(), len(previous.days)
+    else:
+        # 국가가 추가되었거나 과거 값이 바뀌었으면 누적합을 재사용할 수 없으므로 처음부터 만듭니다.
+        engine, known = CorrelationEngine(countries), 0
+    engine.append(days[known:], bleaching[known:], {key: values[known:] for key, values in drivers.items()})
+
+    with _latest_lock:
+        _latest = engine
+    return engine
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def rolling_correlations(version: str) -> np.ndarray:
+    """ROLLING_WINDOWS 별 이동 상관계수 (창, 날짜, 열). 읽기 전용으로 모든 세션이 공유합니다."""
+    perf.cache_miss("rolling_correlations")
+    result = load_correlation_engine(version).rolling(ROLLING_WINDOWS).astype(np.float32)
+    result.flags.writeable = False
+    return result
+
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def build_rolling_figure(version: str, driver: str, country: str, start: datetime.date, end: datetime.date) -> go.Figure:
+    """창 크기별 이동 상관계수 추이. 창마다 표시 구간만 잘라 TREND_CHART_PX 이하의 점으로 줄입니다."""
+    perf.cache_miss("rolling_figure")
+    engine = load_correlation_engine(version)
+    rolling = rolling_correlations(version)
+    lo = engine.days.searchsorted(np.datetime64(start, "ns"))
+    hi = engine.days.searchsorted(np.datetime64(end, "ns"), side="right")
+
+    fig = go.Figure()
+    for window, values in zip(ROLLING_WINDOWS, rolling[:, lo:hi, engine.column(driver, country)]):
+        dates = engine.days[lo:hi]
+        valid = ~np.isnan(values)
+        dates, values = dates[valid], values[valid]
+        picked = DOWNSAMPLERS["LTTB"](dates.view(np.int64), values, TREND_CHART_PX // len(ROLLING_WINDOWS))
+        fig.add_trace(go.Scatter(x=dates[picked], y=np.round(values[picked], 3), mode="lines", name=f"{window}일"))
+    fig.update_layout(
+        title=f"{country} {driver}–백화현상지수 이동 상관",
+        xaxis_title="날짜",
+        yaxis={"title": "상관계수", "range": [-1, 1]},
+        legend_title="창",
+    )
+    return fig
+
+
+def lag_frame(version: str, driver: str, country: str) -> pd.DataFrame:
+    """(시차(일), 상관계수). 양수 시차는 지표가 백화현상 지수보다 그만큼 앞선다는 뜻입니다."""
+    engine = load_correlation_engine(version)
+    values = engine.lagged()[:, engine.column(driver, country)]
+    return pd.DataFrame({"시차(일)": np.arange(len(values)), "상관계수": values})
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def build_lag_figure(version: str, driver: str, country: str) -> go.Figure:
+    """시차별 전체 기간 상관계수."""
+    perf.cache_miss("lag_figure")
+    df_lag = lag_frame(version, driver, country)
+    fig = go.Figure(go.Scatter(x=df_lag["시차(일)"], y=df_lag["상관계수"].round(3), mode="lines"))
+    fig.update_layout(
+        title=f"{country} 시차별 상관 (전체 기간)",
+        xaxis_title="시차(일)",
+        yaxis={"title": "상관계수", "range": [-1, 1]},
+    )
+    return fig
@@ -0,0 +1,164 @@
+"""
+데이터 로딩 계층
+- 백화현상 지수 DataFrame 을 한 번만 생성하고 모든 세션이 같은 객체를 공유합니다 (호출 측은 읽기만 합니다).
+- 고정 시드로 재실행마다 값이 바뀌지 않으며, DATA_VERSION 이 캐시 키에 포함됩니다.
+- ingest.py 로 적재한 NOAA CRW Parquet 이 있으면 예시 데이터 대신 그 자료를 사용합니다.
+"""
+
+import datetime
+import hashlib
+import os
+import pathlib
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.fs
+import streamlit as st
+
+import perf
+from constants import COUNTRIES, END_DATE, START_DATE
+from ingest import PARTITIONING
+
+# 벤치마크용: 예시 데이터를 국가·연도(일별 자료는 국가·날짜)마다 CORAL_DATA_SCALE 개 관측 지점으로 늘립니다 (기본 1).
+DATA_SCALE = int(os.environ.get("CORAL_DATA_SCALE", "1"))
+
+# 데이터 생성 규칙이 바뀌면 DATA_VERSION 을 올려 이전 캐시를 무효화합니다.
+DATA_VERSION = "synthetic-v2" if DATA_SCALE == 1 else f"synthetic-v2-x{DATA_SCALE}"
+DATA_SEED = 20200831
+# 일별 관측 지점 값을 만들 때 한 번에 메모리에 올리는 값의 수
+DAILY_BLOCK_VALUES = 1 << 20
+
+CACHE_TTL = datetime.timedelta(hours=12)
+CACHE_MAX_ENTRIES = 4
+# 차트 Figure 캐시: 연도 수 × 데이터 버전 몇 개 정도는 넉넉히 담을 수 있는 크기
+FIGURE_CACHE_ENTRIES = 128
+
+# ingest.py 의 기본 출력 위치. CORAL_CRW_DIR 환경 변수로 바꿀 수 있습니다.
+CRW_DATA_DIR = pathlib.Path(os.environ.get("CORAL_CRW_DIR", pathlib.Path(__file__).parent / "data" / "crw"))
+
+# 예시 해수온 편차가 백화현상 지수를 앞서는 일수, DHW 누적 기간(12주)
+DRIVER_LAG_DAYS = 28
+DHW_WINDOW_DAYS = 84
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_bleaching_frame(version: str = DATA_VERSION, seed: int = DATA_SEED) -> pd.DataFrame:
+    """연도별 국가 백화현상 지수(예시 데이터)를 반환합니다.
+
+    cache_resource 로 캐시하므로 반환값은 복사되지 않고 모든 세션이 같은 객체를 공유합니다.
+    pandas 는 이 객체에 대한 `df[...] = ...`, `df.loc[...] = ...` 같은 수정을 막지 않으므로,
+    호출 측에서 수정하면 다른 세션에도 그대로 보입니다. 읽기만 하고, 바꿔야 하면 새 객체를 만들어 쓰세요.
+    """
+    perf.cache_miss("bleaching_frame")
+    dates = pd.date_range(START_DATE, END_DATE, freq="YE")
+    rng = np.random.default_rng(seed)
+    data = {
+        "날짜": np.tile(dates, len(COUNTRIES) * DATA_SCALE),
+        "나라": np.repeat(COUNTRIES, len(dates) * DATA_SCALE),
+        "백화현상지수": rng.random(len(dates) * len(COUNTRIES) * DATA_SCALE) * 100
+    }
+    return pd.DataFrame(data)
+
+
+
+def _daily_block_days() -> int:
+    # 관측 지점 값 블록 하나가 DAILY_BLOCK_VALUES 개 안팎이 되도록 날짜 수를 정합니다.
+    return max(DAILY_BLOCK_VALUES // (len(COUNTRIES) * DATA_SCALE), 1)
+
+
+def iter_daily_sites(
+    version: str = DATA_VERSION, seed: int = DATA_SEED, lo: int = 0, hi: int | None = None
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """일별 관측 지점 값(예시 데이터)을 날짜 구간마다 (시작, 끝, 날짜 × COUNTRIES × DATA_SCALE 배열) 로 돌려줍니다.
+
+    연도별 예시 값을 기준선으로 계절 변동과 지점마다 다른 잡음을 더합니다. 블록마다 시드를 따로 두므로
+    lo~hi 구간만 요청해도 전체를 만들 때와 같은 값이 나오고, 메모리에는 블록 하나만 올라옵니다.
+    """
+    days = pd.date_range(START_DATE, END_DATE, freq="D")
+    hi = len(days) if hi is None else hi
+    yearly = load_bleaching_frame(version, seed)
+    levels = yearly.groupby(["날짜", "나라"])["백화현상지수"].mean().unstack()[COUNTRIES].to_numpy()
+    year_rows = np.minimum(days.year.to_numpy() - START_DATE.year, len(levels) - 1)
+    seasonal = 10 * np.sin(2 * np.pi * (days.dayofyear.to_numpy() - 80) / 365.25)
+
+    step = _daily_block_days()
+    for block in range(lo // step * step, hi, step):
+        start, stop = max(block, lo), min(block + step, hi, len(days))
+        rng = np.random.default_rng([seed + 1, block])
+        noise = rng.normal(0, 4, (min(block + step, len(days)) - block, len(COUNTRIES), DATA_SCALE))
+        noise = noise[start - block:stop - block]
+        base = levels[year_rows[start:stop]] + seasonal[start:stop, None]
+        yield start, stop, np.clip(base[:, :, None] + noise, 0, 100).astype(np.float32)
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_daily_matrix(version: str = DATA_VERSION, seed: int = DATA_SEED) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """일별 백화현상 지수(예시 데이터)를 (날짜, 날짜 × COUNTRIES 배열) 로 반환합니다.
+
+    iter_daily_sites 의 관측 지점 값을 나라마다 평균하므로 연평균은 load_bleaching_frame 과 거의 같습니다.
+    배열은 읽기 전용이며 모든 세션이 공유합니다.
+    """
+    perf.cache_miss("daily_matrix")
+    days = pd.date_range(START_DATE, END_DATE, freq="D")
+    values = np.empty((len(days), len(COUNTRIES)), dtype=np.float32)
+    for start, stop, sites in iter_daily_sites(version, seed):
+        values[start:stop] = sites.mean(axis=2)
+    perf.count("rows.daily_sites", values.size * DATA_SCALE)
+    values.flags.writeable = False
+    return days, values
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_daily_drivers(version: str = DATA_VERSION, seed: int = DATA_SEED) -> tuple[np.ndarray, np.ndarray]:
+    """일별 해수온 편차(℃)와 DHW(℃-주)(예시 데이터)를 날짜 × COUNTRIES 배열로 반환합니다.
+
+    예시 자료에서는 백화현상 지수가 해수온 편차를 DRIVER_LAG_DAYS 일 뒤따르도록,
+    표준화한 지수를 그만큼 앞당겨 편차에 섞습니다. DHW 는 NOAA CRW 정의대로
+    최근 12주 동안 1℃ 이상인 편차를 주 단위로 누적한 값입니다.
+    """
+    perf.cache_miss("daily_drivers")
+    days, values = load_daily_matrix(version, seed)
+    rng = np.random.default_rng(seed + 2)
+    z = (values - values.mean(axis=0)) / values.std(axis=0)
+    lead = np.concatenate([z[DRIVER_LAG_DAYS:], np.repeat(z[-1:], DRIVER_LAG_DAYS, axis=0)])
+    ssta = 0.8 * lead + rng.normal(0, 0.3, values.shape)
+
+    hotspots = np.concatenate([np.zeros((1, len(COUNTRIES))), np.cumsum(np.where(ssta >= 1, ssta, 0), axis=0)])
+    window = np.minimum(np.arange(1, len(days) + 1), DHW_WINDOW_DAYS)
+    dhw = (hotspots[1:] - hotspots[np.arange(1, len(days) + 1) - window]) / 7
+
+    ssta, dhw = ssta.astype(np.float32), dhw.astype(np.float32)
+    ssta.flags.writeable = False
+    dhw.flags.writeable = False
+    return ssta, dhw
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def crw_data_version(root: str = str(CRW_DATA_DIR)) -> str | None:
+    """적재된 Parquet 파일 목록/크기/수정 시각으로 데이터 버전을 만듭니다. 파일이 없으면 None."""
+    root_path = pathlib.Path(root)
+    files = sorted(root_path.rglob("*.parquet")) if root_path.is_dir() else []
+    if not files:
+        return None
+    digest = hashlib.sha1()
+    for f in files:
+        stat = f.stat()
+        digest.update(f"{f.relative_to(root_path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return "crw-" + digest.hexdigest()[:12]
+
+
+def data_version() -> str:
+    """현재 대시보드가 사용하는 데이터의 버전 (파생 캐시의 키로 사용)."""
+    return crw_data_version() or DATA_VERSION
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def open_crw_dataset(version: str, root: str = str(CRW_DATA_DIR)) -> ds.Dataset:
+    """Parquet 데이터셋을 메모리 맵 파일시스템으로 엽니다 (메타데이터만 읽음)."""
+    return ds.dataset(
+        root,
+        format="parquet",
+        partitioning=PARTITIONING,
+        filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True),
+    )
@@ -0,0 +1,201 @@
+"""
+필터된 일별 자료 내보내기 (CSV / Parquet)
+- 다운로드 버튼을 누를 때만 파일을 만듭니다. 화면을 다시 그릴 때는 아무것도 만들지 않습니다.
+- 자료는 CHUNK_ROWS 행씩 Arrow 배치로 만들어 곧바로 파일에 쓰므로, 행 수와 상관없이 메모리 사용량이 일정합니다.
+- 완성된 파일은 (데이터 버전, 나라, 연도, 형식, 압축) 별로 디스크(.cache/exports)에 두고,
+  전체 크기가 EXPORT_CACHE_BYTES 를 넘으면 가장 오래 쓰이지 않은 파일부터 지웁니다.
+"""
+
+import gzip
+import hashlib
+import os
+import pathlib
+import threading
+from collections import defaultdict
+from collections.abc import Iterator
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from aggregates import GLOBAL
+from data_layer import (
+    COUNTRIES,
+    DATA_SCALE,
+    DATA_VERSION,
+    iter_daily_sites,
+    load_daily_drivers,
+    load_daily_matrix,
+    open_crw_dataset,
+)
+
+EXPORT_DIR = pathlib.Path(os.environ.get("CORAL_CACHE_DIR", pathlib.Path(__file__).parent / ".cache")) / "exports"
+EXPORT_CACHE_BYTES = 512 * 1024 * 1024
+CHUNK_ROWS = 64 * 1024
+GZIP_LEVEL = 6
+
+EXPORT_SCHEMA = pa.schema([
+    ("날짜", pa.date32()),
+    ("나라", pa.string()),
+    ("백화현상지수", pa.float32()),
+    ("해수온편차", pa.float32()),
+    ("DHW", pa.float32()),
+])
+
+# 형식 → (확장자, MIME, 압축 시 확장자)
+FORMATS = {
+    "CSV": ("csv", "text/csv", "csv.gz"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", "parquet"),
+}
+
+# 같은 파일을 여러 세션이 동시에 만들지 않도록 키마다 잠급니다.
+_build_locks: defaultdict[str, threading.Lock] = defaultdict(threading.Lock)
+_locks_guard = threading.Lock()
+
+
+def _synthetic_batches(country: str, year: int | None) -> Iterator[pa.RecordBatch]:
+    days, _ = load_daily_matrix()
+    ssta, dhw = load_daily_drivers()
+    columns = list(range(len(COUNTRIES))) if country == GLOBAL else [COUNTRIES.index(country)]
+    lo, hi = 0, len(days)
+    if year is not None:
+        lo, hi = days.searchsorted(f"{year}-01-01"), days.searchsorted(f"{year + 1}-01-01")
+
+    dates = days.to_numpy().astype("datetime64[D]")
+    names = np.array(COUNTRIES, dtype=object)[columns]
+    # 관측 지점 값을 날짜 구간 블록으로 받아, 한 배치가 CHUNK_ROWS 행 안팎이 되도록 날짜 단위로 잘라
+    # 행(날짜 × 나라 × 지점)으로 펼칩니다. 해수온 편차·DHW 는 나라 단위 값이므로 지점마다 반복합니다.
+    site_names = np.repeat(names, DATA_SCALE)
+    step = max(CHUNK_ROWS // len(site_names), 1)
+    for block_start, block_stop, sites in iter_daily_sites(lo=lo, hi=hi):
+        sites = sites[:, columns]
+        for start in range(block_start, block_stop, step):
+            stop = min(start + step, block_stop)
+            yield pa.RecordBatch.from_arrays(
+                [
+                    pa.array(np.repeat(dates[start:stop], len(site_names))),
+                    pa.array(np.tile(site_names, stop - start)),
+                    pa.array(sites[start - block_start:stop - block_start].ravel()),
+                    pa.array(np.repeat(ssta[start:stop, columns].ravel(), DATA_SCALE)),
+                    pa.array(np.repeat(dhw[start:stop, columns].ravel(), DATA_SCALE)),
+                ],
+                schema=EXPORT_SCHEMA,
+            )
+
+
+def _crw_batches(version: str, country: str, year: int | None) -> Iterator[pa.RecordBatch]:
+    expression = None
+    if country != GLOBAL:
+        expression = ds.field("country") == country
+    if year is not None:
+        condition = ds.field("year") == year
+        expression = condition if expression is None else expression & condition
+    scanner = open_crw_dataset(version).scanner(
+        columns=["date", "country", "bleaching_index", "ssta", "dhw"],
+        filter=expression,
+        batch_size=CHUNK_ROWS,
+        # 미리 읽기를 최소로 두어 메모리에 올라오는 배치 수를 일정하게 유지합니다.
+        batch_readahead=1,
+        fragment_readahead=1,
+        use_threads=False,
+    )
+    batches = (
+        pa.RecordBatch.from_arrays(
+            [column.cast(field.type) for column, field in zip(batch.columns, EXPORT_SCHEMA)],
+            schema=EXPORT_SCHEMA,
+        )
+        for batch in scanner.to_batches()
+    )
+    yield from _rebatch(batches, CHUNK_ROWS)
+
+
+def _rebatch(batches: Iterator[pa.RecordBatch], rows: int) -> Iterator[pa.RecordBatch]:
+    """파티션마다 잘게 나뉜 배치를 rows 행 안팎으로 모읍니다 (Parquet 행 그룹이 너무 작아지지 않도록)."""
+    pending, count = [], 0
+    for batch in batches:
+        pending.append(batch)
+        count += batch.num_rows
+        if count >= rows:
+            yield pa.Table.from_batches(pending, EXPORT_SCHEMA).combine_chunks().to_batches()[0]
+            pending, count = [], 0
+    if count:
+        yield pa.Table.from_batches(pending, EXPORT_SCHEMA).combine_chunks().to_batches()[0]
+
+
+def iter_batches(version: str, country: str, year: int | None = None) -> Iterator[pa.RecordBatch]:
+    """필터(나라, 연도)에 맞는 일별 행을 EXPORT_SCHEMA 배치로 차례대로 돌려줍니다. year=None 이면 전체 기간."""
+    if version == DATA_VERSION:
+        return _synthetic_batches(country, year)
+    return _crw_batches(version, country, year)
+
+
+def file_name(country: str, year: int | None, fmt: str, compressed: bool) -> str:
+    extension, _, compressed_extension = FORMATS[fmt]
+    period = str(year) if year is not None else "전체기간"
+    return f"산호초_백화현상_{country}_{period}.{compressed_extension if compressed else extension}"
+
+
+def mime_type(fmt: str, compressed: bool) -> str:
+    return "application/gzip" if fmt == "CSV" and compressed else FORMATS[fmt][1]
+
+
+def _write(path: pathlib.Path, batches: Iterator[pa.RecordBatch], fmt: str, compressed: bool) -> None:
+    """배치를 하나씩 파일에 씁니다. 한 번에 메모리에 있는 것은 배치 하나뿐입니다."""
+    if fmt == "Parquet":
+        with pq.ParquetWriter(path, EXPORT_SCHEMA, compression="zstd" if compressed else "none") as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+        return
+
+    # pyarrow 의 gzip 스트림은 파이썬 gzip 보다 몇 배 느려서 압축은 gzip 모듈에 맡깁니다.
+    with (gzip.open(path, "wb", compresslevel=GZIP_LEVEL) if compressed else pa.OSFile(str(path), "wb")) as sink:
+        with pa.csv.CSVWriter(sink, EXPORT_SCHEMA) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+
+def _evict(keep: pathlib.Path) -> None:
+    """전체 크기가 EXPORT_CACHE_BYTES 이하가 될 때까지 마지막 사용 시각이 오래된 파일부터 지웁니다."""
+    files = []
+    for path in EXPORT_DIR.glob("*.export"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= EXPORT_CACHE_BYTES:
+            break
+        if path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def export_path(version: str, country: str, year: int | None, fmt: str, compressed: bool) -> pathlib.Path:
+    """내보내기 파일 경로. 캐시에 없으면 이때 만들고, 있으면 사용 시각만 갱신합니다."""
+    key = hashlib.sha1(f"{version}|{country}|{year}|{fmt}|{compressed}".encode("utf-8")).hexdigest()[:20]
+    path = EXPORT_DIR / f"{key}.export"
+    with _locks_guard:
+        lock = _build_locks[key]
+    with lock:
+        if path.exists():
+            os.utime(path)
+            return path
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            _write(tmp, iter_batches(version, country, year), fmt, compressed)
+            tmp.replace(path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        _evict(keep=path)
+    return path
+
+
+def export_bytes(version: str, country: str, year: int | None, fmt: str, compressed: bool) -> bytes:
+    """다운로드 버튼용 (버튼을 누를 때 호출됨). Streamlit 은 다운로드를 메모리에 두므로 완성된 파일만 읽어 넘깁니다."""
+    return export_path(version, country, year, fmt, compressed).read_bytes()
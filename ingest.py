@@ -0,0 +1,196 @@
+"""
+NOAA Coral Reef Watch(CRW) 일별 SST/DHW 자료 적재 스크립트
+- 로컬 CSV(가상 관측소 시계열) 또는 NetCDF 파일을 한 번 읽어 연도/국가별로 분할된 Parquet 으로 변환합니다.
+- 대시보드는 변환된 Parquet 을 메모리 맵으로 열고 필요한 열만 읽습니다 (data_layer 참고).
+
+사용 예:
+    $ python ingest.py noaa/australia.csv noaa/japan.nc --out data/crw
+    $ python ingest.py noaa/*.txt --country 호주 --out data/crw
+"""
+
+import argparse
+import itertools
+import pathlib
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# 디스크 스키마 (열 이름은 도구 호환을 위해 ASCII 로 저장합니다)
+CRW_SCHEMA = pa.schema([
+    ("date", pa.timestamp("ms")),
+    ("country", pa.string()),
+    ("sst", pa.float32()),
+    ("ssta", pa.float32()),
+    ("dhw", pa.float32()),
+    ("bleaching_index", pa.float32()),
+    ("year", pa.int16()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([("year", pa.int16()), ("country", pa.string())]), flavor="hive")
+
+# CRW 파일에서 자주 쓰이는 열 이름 → 디스크 스키마 열 이름
+COLUMN_ALIASES = {
+    "sst": "sst",
+    "sst_mean": "sst",
+    "analysed_sst": "sst",
+    "sst@90th_hs": "sst",
+    "ssta": "ssta",
+    "sst_anomaly": "ssta",
+    "ssta@90th_hs": "ssta",
+    "dhw": "dhw",
+    "degree_heating_week": "dhw",
+    "dhw_from_90th_hs>1": "dhw",
+    "baa": "baa",
+    "baa_7day_max": "baa",
+    "bleaching_alert_area": "baa",
+    "bleaching_index": "bleaching_index",
+    "country": "country",
+    "region": "country",
+    "date": "date",
+    "time": "date",
+}
+
+# 영문 국가/지역명 → 대시보드 국가명
+COUNTRY_ALIASES = {
+    "south korea": "대한민국",
+    "korea": "대한민국",
+    "australia": "호주",
+    "indonesia": "인도네시아",
+    "philippines": "필리핀",
+    "japan": "일본",
+    "maldives": "몰디브",
+    "hawaii": "미국 하와이",
+    "united states": "미국 하와이",
+}
+
+# CRW 가상 관측소 텍스트는 자유 형식 설명 블록 뒤에 'YYYY MM DD SST@90th_HS ...' 열 제목 줄이 옵니다.
+CRW_TEXT_HEADER = re.compile(r"^\s*YYYY[\s,]+MM[\s,]+DD\b")
+HEADER_SCAN_LINES = 200
+
+# DHW 12℃-weeks 이상이면 대규모 백화·폐사 위험 단계로 봅니다 (CRW Alert Level 2 이상).
+DHW_SATURATION = 12.0
+
+
+def normalize_country(name: str) -> str:
+    return COUNTRY_ALIASES.get(name.strip().lower(), name.strip())
+
+
+def _country_from_path(path: pathlib.Path) -> str:
+    # 예: "australia_5km.csv", "south_korea.nc" → 파일명 앞부분을 국가명으로 사용
+    stem = re.split(r"[_\-.]\d", path.stem)[0]
+    return normalize_country(stem.replace("_", " "))
+
+
+def _finalize(frame: pd.DataFrame, country: str | None) -> pd.DataFrame:
+    """별칭 열을 정리하고 백화현상 지수를 채워 디스크 스키마 순서로 맞춥니다."""
+    frame = frame.rename(columns=lambda c: COLUMN_ALIASES.get(str(c).strip().lower(), c))
+    if "date" not in frame:
+        frame = frame.assign(date=pd.to_datetime(frame[["YYYY", "MM", "DD"]].set_axis(["year", "month", "day"], axis=1)))
+    if country is not None:
+        frame = frame.assign(country=country)
+    elif "country" in frame:
+        frame = frame.assign(country=frame["country"].astype(str).map(normalize_country))
+    else:
+        raise ValueError("국가 정보가 없습니다. --country 를 지정하거나 country 열을 포함하세요.")
+
+    for col in ("sst", "ssta", "dhw"):
+        if col not in frame:
+            frame[col] = np.nan
+
+    # 백화현상 지수(0~100): 원자료에 없으면 BAA(0~4) 또는 DHW 에서 환산합니다.
+    if "bleaching_index" not in frame:
+        if "baa" in frame:
+            frame["bleaching_index"] = frame["baa"].clip(0, 4) * 25.0
+        else:
+            frame["bleaching_index"] = (frame["dhw"] / DHW_SATURATION).clip(0, 1) * 100.0
+
+    frame = frame.assign(date=pd.to_datetime(frame["date"]).dt.tz_localize(None).dt.normalize())
+    frame = frame.assign(year=frame["date"].dt.year.astype("int16"))
+    return frame[CRW_SCHEMA.names]
+
+
+def _header_row(path: pathlib.Path) -> int:
+    """CRW 텍스트 앞머리의 설명 블록을 건너뛰도록, 'YYYY MM DD ...' 열 제목 줄의 번호를 찾습니다 (없으면 0)."""
+    with path.open(encoding="utf-8", errors="replace") as f:
+        for number, line in enumerate(itertools.islice(f, HEADER_SCAN_LINES)):
+            if CRW_TEXT_HEADER.match(line):
+                return number
+    return 0
+
+
+def read_crw_csv(path: pathlib.Path, country: str | None = None) -> pd.DataFrame:
+    """CRW 가상 관측소 시계열을 읽습니다. .txt 는 공백 정렬 텍스트, 그 외에는 구분자를 추정합니다."""
+    skip = _header_row(path)
+    if path.suffix.lower() == ".txt":
+        frame = pd.read_csv(path, sep=r"\s+", skiprows=skip, comment="#")
+    else:
+        frame = pd.read_csv(path, sep=None, engine="python", skiprows=skip, comment="#")
+    if country is None and not any(str(c).strip().lower() in ("country", "region") for c in frame.columns):
+        country = _country_from_path(path)
+    return _finalize(frame, country)
+
+
+def read_crw_netcdf(path: pathlib.Path, country: str | None = None) -> pd.DataFrame:
+    """CRW NetCDF(격자) 파일을 읽어 일별 공간 평균 시계열로 줄입니다. xarray 가 필요합니다."""
+    try:
+        import xarray as xr
+    except ImportError as e:
+        raise ImportError("NetCDF 파일을 읽으려면 xarray 와 netCDF4 가 필요합니다: pip install xarray netCDF4") from e
+
+    with xr.open_dataset(path) as dataset:
+        spatial = [d for d in dataset.dims if d in ("lat", "lon", "latitude", "longitude")]
+        variables = [v for v in dataset.data_vars if COLUMN_ALIASES.get(v.lower()) in ("sst", "ssta", "dhw", "baa")]
+        frame = dataset[variables].mean(dim=spatial).to_dataframe().reset_index()
+    return _finalize(frame, country or _country_from_path(path))
+
+
+def read_source(path: pathlib.Path, country: str | None = None) -> pd.DataFrame:
+    if path.suffix.lower() in (".nc", ".nc4", ".netcdf"):
+        return read_crw_netcdf(path, country)
+    return read_crw_csv(path, country)
+
+
+def write_partitioned(frame: pd.DataFrame, out_dir: pathlib.Path) -> None:
+    """연도/국가(year=YYYY/country=...) 단위 hive 파티션 Parquet 으로 저장합니다.
+
+    같은 (연도, 국가) 파티션만 덮어쓰므로 국가별 파일을 나눠서 적재해도 됩니다.
+    """
+    table = pa.Table.from_pandas(frame, schema=CRW_SCHEMA, preserve_index=False)
+    table = table.sort_by([("date", "ascending")])
+    ds.write_dataset(
+        table,
+        out_dir,
+        format="parquet",
+        partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+        max_rows_per_group=1 << 16,
+    )
+
+
+def ingest(paths: list[pathlib.Path], out_dir: pathlib.Path, country: str | None = None) -> int:
+    """원본 파일들을 읽어 out_dir 에 적재하고 적재한 행 수를 반환합니다."""
+    frame = pd.concat([read_source(p, country) for p in paths], ignore_index=True)
+    frame = frame.drop_duplicates(["country", "date"], keep="last")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    write_partitioned(frame, out_dir)
+    return len(frame)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="NOAA CRW SST/DHW 파일을 Parquet 으로 변환합니다.")
+    parser.add_argument("sources", nargs="+", type=pathlib.Path, help="CSV/텍스트 또는 NetCDF 파일")
+    parser.add_argument("--out", type=pathlib.Path, default=pathlib.Path("data/crw"), help="출력 디렉터리")
+    parser.add_argument("--country", help="모든 입력 파일에 적용할 국가명 (예: 호주)")
+    args = parser.parse_args(argv)
+
+    country = normalize_country(args.country) if args.country else None
+    rows = ingest(args.sources, args.out, country)
+    print(f"{rows:,} 행을 {args.out} 에 적재했습니다.")
+
+
+if __name__ == "__main__":
+    main()
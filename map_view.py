@@ -0,0 +1,158 @@
+"""
+국가별 백화현상 지도(choropleth)
+- 국가명은 ISO-3 코드로 미리 바꿔 두어 Plotly 가 매번 이름을 매칭하지 않도록 합니다.
+- 완성된 Figure 는 (데이터 버전, 연도) 별로 캐시되어 같은 연도를 다시 그릴 때 재생성하지 않습니다.
+- 애니메이션 모드는 모든 연도를 한 Figure 의 프레임으로 묶어 브라우저에서 재생/탐색합니다.
+- 산호초 지점 지도는 보이는 영역을 칸으로 묶은 집계만 scattergeo 로 그리므로 지점 수와 무관하게 크기가 일정합니다.
+"""
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import perf
+from aggregates import load_aggregate_index
+from data_layer import FIGURE_CACHE_ENTRIES
+from reef_sites import bin_sites
+
+MAP_LEVELS = ["국가별", "산호초 지점"]
+
+# 대시보드 국가명 → ISO-3 코드 ('전 지구'는 지도에 표시하지 않습니다)
+COUNTRY_ISO3 = {
+    "대한민국": "KOR",
+    "호주": "AUS",
+    "인도네시아": "IDN",
+    "필리핀": "PHL",
+    "일본": "JPN",
+    "몰디브": "MDV",
+    "미국 하와이": "USA",
+}
+
+# 애니메이션 페이로드 상한: 프레임 수와 (프레임 × 국가) 값 개수.
+# 넘으면 연도를 일정 간격으로 건너뛰어 프레임 수를 줄입니다.
+MAX_ANIMATION_FRAMES = 60
+MAX_ANIMATION_VALUES = 50_000
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def build_choropleth(version: str, year: int) -> go.Figure:
+    """해당 연도의 국가별 백화현상 지수 지도. 반환된 Figure 는 공유되므로 수정하지 마세요."""
+    perf.cache_miss("choropleth")
+    df_map = load_aggregate_index(version).year_frame(year)
+    df_map = df_map.assign(iso3=df_map["나라"].map(COUNTRY_ISO3)).dropna(subset=["iso3"])
+    with perf.span("px.choropleth"):
+        return px.choropleth(
+            df_map,
+            locations="iso3",
+            locationmode="ISO-3",
+            color="백화현상지수",
+            hover_name="나라",
+            title=f"{year}년 국가별 산호초 백화현상 지수",
+            color_continuous_scale="Reds"
+        )
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_choropleth_animation(version: str) -> go.Figure:
+    """모든 연도를 프레임으로 담은 지도. 재생과 연도 이동은 브라우저에서만 일어납니다.
+
+    위치/이름/색상축은 기본 trace 와 layout 에 한 번만 싣고, 각 프레임에는 바뀌는 z 값만 담습니다.
+    """
+    perf.cache_miss("choropleth_animation")
+    index = load_aggregate_index(version)
+    names = [c for c in index.countries if c in COUNTRY_ISO3]
+    columns = [index.column(c) for c in names]
+    values = np.round(index.mean()[:, columns], 1)
+    years = index.years
+
+    # 프레임이 상한을 넘으면 일정 간격으로 연도를 고릅니다 (마지막 연도는 항상 포함).
+    max_frames = max(1, min(MAX_ANIMATION_FRAMES, MAX_ANIMATION_VALUES // max(len(names), 1)))
+    rows = np.arange(len(years))
+    if len(rows) > max_frames:
+        rows = np.unique(np.append(rows[::int(np.ceil(len(rows) / max_frames))], len(rows) - 1))
+
+    finite = values[rows][np.isfinite(values[rows])]
+    zmin, zmax = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 100.0)
+
+    def z_of(row: int) -> list:
+        return [None if np.isnan(v) else float(v) for v in values[row]]
+
+    fig = go.Figure(
+        data=[go.Choropleth(
+            locations=[COUNTRY_ISO3[c] for c in names],
+            locationmode="ISO-3",
+            z=z_of(rows[0]) if len(rows) else [],
+            text=names,
+            hovertemplate="%{text}: %{z}<extra></extra>",
+            coloraxis="coloraxis",
+        )],
+        frames=[go.Frame(name=str(years[r]), data=[{"type": "choropleth", "z": z_of(r)}], traces=[0]) for r in rows],
+    )
+    steps = [
+        {"label": str(years[r]), "method": "animate",
+         "args": [[str(years[r])], {"mode": "immediate", "frame": {"duration": 0, "redraw": True}}]}
+        for r in rows
+    ]
+    fig.update_layout(
+        title="연도별 국가별 산호초 백화현상 지수",
+        coloraxis={"colorscale": "Reds", "cmin": zmin, "cmax": zmax, "colorbar": {"title": {"text": "백화현상지수"}}},
+        geo={"showframe": False},
+        margin={"l": 0, "r": 0, "t": 40, "b": 0},
+        sliders=[{"steps": steps, "currentvalue": {"prefix": "연도: "}, "pad": {"t": 30}}],
+        updatemenus=[{
+            "type": "buttons",
+            "showactive": False,
+            "x": 0, "y": 0, "xanchor": "right", "yanchor": "top",
+            "pad": {"t": 30, "r": 10},
+            "buttons": [
+                {"label": "▶", "method": "animate",
+                 "args": [None, {"frame": {"duration": 300, "redraw": True}, "fromcurrent": True}]},
+                {"label": "⏸", "method": "animate",
+                 "args": [[None], {"mode": "immediate", "frame": {"duration": 0, "redraw": False}}]},
+            ],
+        }],
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def build_site_map(version: str, year: int, region: str, zoom: int, method: str) -> go.Figure:
+    """산호초 지점을 칸별로 묶은 지도. 색은 칸 평균 지수, 크기는 칸 안의 지점 수입니다."""
+    perf.cache_miss("site_map")
+    with perf.span("site.binning"):
+        bins = bin_sites(version, year, region, zoom, method)
+    perf.count("rows.site_bins", len(bins.count))
+
+    # 지점 수는 칸마다 수십~수만 배 차이 나므로 로그 눈금으로 점 크기를 정합니다.
+    log_count = np.log1p(bins.count)
+    size = 4 + 10 * log_count / log_count.max() if len(log_count) else []
+    west, east, south, north = bins.bounds
+    fig = go.Figure(go.Scattergeo(
+        lon=np.round(bins.lon, 3),
+        lat=np.round(bins.lat, 3),
+        customdata=bins.count,
+        marker={
+            "size": size,
+            "color": np.round(bins.mean, 1),
+            "coloraxis": "coloraxis",
+            "line": {"width": 0},
+        },
+        hovertemplate="지점 %{customdata:,}개<br>평균 지수 %{marker.color}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"{year}년 산호초 지점 백화현상 지수 (지점 {bins.total:,}개 → {len(bins.count):,}칸)",
+        coloraxis={"colorscale": "Reds", "cmin": 0, "cmax": 100, "colorbar": {"title": {"text": "백화현상지수"}}},
+        geo={
+            "projection": {"type": "equirectangular"},
+            "lonaxis": {"range": [west, east]},
+            "lataxis": {"range": [south, north]},
+            "showframe": False,
+            "showland": True,
+            "landcolor": "#eeeeee",
+            "showcountries": True,
+            "resolution": 50 if zoom >= 2 else 110,
+        },
+        margin={"l": 0, "r": 0, "t": 40, "b": 0},
+    )
+    return fig
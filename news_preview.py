@@ -0,0 +1,291 @@
+"""
+뉴스 기사 미리보기 캐시
+- 기사 URL 마다 제목, 첫 문단, 축소된 대표 이미지를 한 번만 가져와 디스크(.cache/news)에 저장합니다.
+- 처음 가져오기와 TTL 이 지난 항목의 갱신은 모두 백그라운드 스레드에서 합니다. 화면은 그동안
+  기존 캐시(있으면)나 원문 링크를 보여 주므로 재실행이 네트워크를 기다리지 않습니다 (stale-while-revalidate).
+- 각 요청은 연결부터 본문까지 통틀어 FETCH_TIMEOUT 초 안에 끝나며, 실패하면 기존 캐시를 유지하고
+  RETRY_AFTER 동안 다시 시도하지 않습니다.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import html.parser
+import http.client
+import io
+import json
+import os
+import pathlib
+import socket
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from PIL import Image
+
+CACHE_DIR = pathlib.Path(os.environ.get("CORAL_CACHE_DIR", pathlib.Path(__file__).parent / ".cache")) / "news"
+
+PREVIEW_TTL = 6 * 60 * 60          # 이 시간 안의 캐시는 그대로 사용
+PREVIEW_MAX_STALE = 7 * 24 * 60 * 60  # 이 시간까지는 오래된 캐시를 보여 주며 백그라운드 갱신
+FETCH_TIMEOUT = 5                  # 요청 하나(연결~본문)의 전체 제한 시간
+# 가져오기에 실패한 기사는 이 시간 동안 다시 시도하지 않습니다.
+RETRY_AFTER = 10 * 60
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+THUMBNAIL_SIZE = (480, 270)
+LEAD_MAX_CHARS = 300
+
+USER_AGENT = "Mozilla/5.0 (compatible; coral-dashboard-preview/1.0)"
+
+_refreshing: set[str] = set()
+_refresh_lock = threading.Lock()
+_failed_at: dict[str, float] = {}
+
+
+@dataclasses.dataclass
+class ArticlePreview:
+    url: str
+    title: str
+    lead: str
+    thumbnail: str | None
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class _PreviewParser(html.parser.HTMLParser):
+    """og:/meta 태그와 <title>, 첫 번째 본문 문단을 모읍니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: dict[str, str] = {}
+        self.title = ""
+        self.first_paragraph = ""
+        self._in_title = False
+        self._in_p = False
+        self._p_buffer: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            name = (attrs.get("property") or attrs.get("name") or "").lower()
+            if name and attrs.get("content"):
+                self.meta.setdefault(name, attrs["content"].strip())
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "p" and not self.first_paragraph:
+            self._in_p, self._p_buffer = True, []
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "p" and self._in_p:
+            self._in_p = False
+            text = " ".join("".join(self._p_buffer).split())
+            # 메뉴/저작권 같은 짧은 문단은 건너뜁니다.
+            if len(text) >= 40:
+                self.first_paragraph = text
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif self._in_p:
+            self._p_buffer.append(data)
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+class _Deadline:
+    """요청 전체의 마감 시각. 마감이 지나면 연결된 소켓을 끊어, 조금씩 흘려 보내는 서버도 기다리지 않습니다.
+
+    urlopen(timeout=) 은 소켓 연산 하나하나의 제한이라, 바이트를 조금씩 계속 보내는 서버에는 끝없이 늘어납니다.
+    """
+
+    def __init__(self, seconds: float):
+        self.at = time.monotonic() + seconds
+        self._timers: list[threading.Timer] = []
+
+    def remaining(self) -> float:
+        return max(self.at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def watch(self, sock: socket.socket) -> None:
+        timer = threading.Timer(self.remaining(), self._shutdown, args=(sock,))
+        timer.daemon = True
+        self._timers.append(timer)
+        timer.start()
+
+    @staticmethod
+    def _shutdown(sock: socket.socket) -> None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # 이미 닫힌 소켓
+
+    def cancel(self) -> None:
+        for timer in self._timers:
+            timer.cancel()
+
+
+class _DeadlineHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, deadline: _Deadline, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._deadline = deadline
+
+    def connect(self):
+        super().connect()
+        self._deadline.watch(self.sock)
+
+
+class _DeadlineHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, deadline: _Deadline, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._deadline = deadline
+
+    def connect(self):
+        super().connect()
+        self._deadline.watch(self.sock)
+
+
+class _DeadlineHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, deadline: _Deadline):
+        super().__init__()
+        self._deadline = deadline
+
+    def http_open(self, req):
+        return self.do_open(functools.partial(_DeadlineHTTPConnection, deadline=self._deadline), req)
+
+
+class _DeadlineHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, deadline: _Deadline):
+        super().__init__()
+        self._deadline = deadline
+
+    def https_open(self, req):
+        return self.do_open(functools.partial(_DeadlineHTTPSConnection, deadline=self._deadline), req, context=self._context)
+
+
+def http_get(
+    url: str, max_bytes: int, timeout: float | None = None, user_agent: str = USER_AGENT
+) -> tuple[bytes, str | None]:
+    """url 을 max_bytes 까지 읽습니다. 리디렉션을 포함한 전체 요청이 timeout(기본 FETCH_TIMEOUT)초를 넘으면 TimeoutError.
+
+    assets.py 도 같은 마감 처리로 퀴즈 이미지를 내려받습니다.
+    """
+    timeout = FETCH_TIMEOUT if timeout is None else timeout
+    deadline = _Deadline(timeout)
+    opener = urllib.request.build_opener(_DeadlineHTTPHandler(deadline), _DeadlineHTTPSHandler(deadline))
+    request = urllib.request.Request(url, headers={"User-Agent": user_agent})
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            raw = response.read(max_bytes)
+            charset = response.headers.get_content_charset()
+    except OSError:
+        if deadline.expired():
+            raise TimeoutError(f"{timeout}초 안에 응답을 받지 못했습니다: {url}") from None
+        raise
+    finally:
+        deadline.cancel()
+    # 마감에 걸려 소켓이 끊기면 본문이 잘린 채로 끝날 수 있으므로 잘린 결과는 버립니다.
+    if deadline.expired():
+        raise TimeoutError(f"{timeout}초 안에 응답을 받지 못했습니다: {url}")
+    return raw, charset
+
+
+def _save_thumbnail(image_url: str, key: str) -> str | None:
+    try:
+        raw, _ = http_get(image_url, MAX_IMAGE_BYTES)
+        with Image.open(io.BytesIO(raw)) as image:
+            image = image.convert("RGB")
+            image.thumbnail(THUMBNAIL_SIZE)
+            path = CACHE_DIR / f"{key}.jpg"
+            image.save(path, "JPEG", quality=80, optimize=True)
+        return path.name
+    except Exception:
+        return None
+
+
+def fetch_preview(url: str) -> ArticlePreview:
+    """기사를 내려받아 미리보기를 만들고 디스크에 저장합니다. 실패하면 예외가 그대로 올라갑니다."""
+    raw, charset = http_get(url, MAX_PAGE_BYTES)
+    parser = _PreviewParser()
+    parser.feed(raw.decode(charset or "utf-8", errors="replace"))
+
+    meta = parser.meta
+    title = meta.get("og:title") or meta.get("twitter:title") or parser.title.strip() or url
+    lead = meta.get("og:description") or meta.get("description") or parser.first_paragraph
+    if len(lead) > LEAD_MAX_CHARS:
+        lead = lead[:LEAD_MAX_CHARS].rstrip() + "…"
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    key = _cache_key(url)
+    image_url = meta.get("og:image") or meta.get("twitter:image")
+    thumbnail = _save_thumbnail(urllib.parse.urljoin(url, image_url), key) if image_url else None
+
+    preview = ArticlePreview(url, title, lead, thumbnail, time.time())
+    tmp = CACHE_DIR / f"{key}.json.tmp"
+    tmp.write_text(json.dumps(dataclasses.asdict(preview), ensure_ascii=False), encoding="utf-8")
+    tmp.replace(CACHE_DIR / f"{key}.json")
+    return preview
+
+
+def _load_cached(url: str) -> ArticlePreview | None:
+    try:
+        data = json.loads((CACHE_DIR / f"{_cache_key(url)}.json").read_text(encoding="utf-8"))
+        return ArticlePreview(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _refresh_in_background(url: str) -> None:
+    with _refresh_lock:
+        if url in _refreshing or time.monotonic() - _failed_at.get(url, -RETRY_AFTER) < RETRY_AFTER:
+            return
+        _refreshing.add(url)
+
+    def run():
+        try:
+            fetch_preview(url)
+            _failed_at.pop(url, None)
+        except Exception:
+            _failed_at[url] = time.monotonic()  # 기존 캐시는 그대로 남습니다.
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(url)
+
+    threading.Thread(target=run, name=f"news-preview-{_cache_key(url)[:8]}", daemon=True).start()
+
+
+def is_fetching(url: str) -> bool:
+    """백그라운드에서 이 기사를 가져오는 중인지."""
+    with _refresh_lock:
+        return url in _refreshing
+
+
+def get_preview(url: str) -> ArticlePreview | None:
+    """캐시된 미리보기를 곧바로 반환합니다 (네트워크를 기다리지 않음). 없거나 오래되었으면 백그라운드에서 가져옵니다.
+
+    PREVIEW_MAX_STALE 보다 오래된 캐시는 가져오는 동안에는 None 으로 숨기고, 가져오기에 실패했을 때만 돌려줍니다.
+    None 일 때 is_fetching() 으로 가져오는 중인지, 실패했는지 구분할 수 있습니다.
+    """
+    cached = _load_cached(url)
+    if cached is not None and cached.age < PREVIEW_TTL:
+        return cached
+    _refresh_in_background(url)
+    if cached is not None and cached.age >= PREVIEW_MAX_STALE and is_fetching(url):
+        return None
+    return cached
+
+
+def thumbnail_path(preview: ArticlePreview) -> pathlib.Path | None:
+    if preview.thumbnail is None:
+        return None
+    path = CACHE_DIR / preview.thumbnail
+    return path if path.exists() else None
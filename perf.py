@@ -0,0 +1,164 @@
+"""
+재실행 계측
+- 단계별 시간 구간(span), 캐시 적중/실패, 처리 행 수를 한 번의 재실행 단위로 모읍니다.
+- 켜는 방법: 환경 변수 CORAL_PERF=1 (모든 세션) 또는 주소에 ?debug=1 (해당 세션만).
+- 재실행마다 JSON 한 줄을 'coral.perf' 로거로 표준 오류에 남깁니다. CORAL_PERF_LOG 를 지정하면 그 파일에 씁니다.
+- 꺼져 있으면 span() 은 미리 만들어 둔 빈 컨텍스트를 돌려주므로 비용이 거의 없습니다.
+"""
+
+import collections
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+ENABLED = os.environ.get("CORAL_PERF", "") not in ("", "0")
+HISTORY_SIZE = 20
+
+# 루트 로거 수준(기본 WARNING)과 상관없이 기록이 남도록 자체 핸들러를 둡니다.
+logger = logging.getLogger("coral.perf")
+if not logger.handlers:
+    if os.environ.get("CORAL_PERF_LOG"):
+        _handler = logging.FileHandler(os.environ["CORAL_PERF_LOG"], encoding="utf-8")
+    else:
+        _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# 스크립트는 세션마다 별도 스레드에서 실행되므로 현재 추적 정보는 스레드별로 둡니다.
+_local = threading.local()
+_NOOP = contextlib.nullcontext()
+
+
+class RerunTrace:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.spans: dict[str, list[float]] = {}
+        self.counters: collections.Counter = collections.Counter()
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            entry = self.spans.setdefault(name, [0.0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+
+    def to_record(self) -> dict:
+        counters = dict(self.counters)
+        # 조회 수와 실패 수로 적중 수를 계산합니다.
+        for key in [k for k in counters if k.startswith("cache.") and k.endswith(".lookup")]:
+            name = key[:-len(".lookup")]
+            counters[f"{name}.hit"] = counters[key] - counters.get(f"{name}.miss", 0)
+        return {
+            "ts": time.time(),
+            "kind": self.kind,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "spans": {name: {"ms": round(ms, 2), "calls": calls} for name, (ms, calls) in self.spans.items()},
+            "counters": counters,
+        }
+
+
+def _current() -> RerunTrace | None:
+    return getattr(_local, "trace", None)
+
+
+def is_enabled() -> bool:
+    """이 세션에서 계측이 켜져 있는지 (환경 변수 또는 ?debug=1)."""
+    if ENABLED:
+        return True
+    if st.query_params.get("debug") == "1":
+        st.session_state["perf_debug"] = True
+    return st.session_state.get("perf_debug", False)
+
+
+def begin_rerun(kind: str = "app") -> None:
+    _local.trace = RerunTrace(kind) if is_enabled() else None
+
+
+def end_rerun() -> dict | None:
+    """현재 재실행 기록을 마무리해 세션 기록과 로그에 남기고 반환합니다."""
+    trace = _current()
+    _local.trace = None
+    if trace is None:
+        return None
+
+    record = trace.to_record()
+    ctx = get_script_run_ctx()
+    record["session"] = ctx.session_id if ctx is not None else None
+    history = st.session_state.setdefault("perf_history", collections.deque(maxlen=HISTORY_SIZE))
+    history.append(record)
+    logger.info(json.dumps(record, ensure_ascii=False))
+    return record
+
+
+def span(name: str):
+    """이름 붙은 시간 구간. 계측이 꺼져 있으면 아무 일도 하지 않습니다."""
+    trace = _current()
+    return _NOOP if trace is None else trace.span(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    trace = _current()
+    if trace is not None:
+        trace.counters[name] += n
+
+
+def cached(name: str):
+    """캐시된 함수 호출 구간. 함수 본문에서 cache_miss(name) 을 부르면 실패로 집계됩니다."""
+    trace = _current()
+    if trace is None:
+        return _NOOP
+    trace.counters[f"cache.{name}.lookup"] += 1
+    return trace.span(name)
+
+
+def cache_miss(name: str) -> None:
+    count(f"cache.{name}.miss")
+
+
+def fragment_scope(kind: str):
+    """fragment 만 다시 실행될 때도 별도 재실행으로 기록되도록 감쌉니다 (@st.fragment 아래에 사용)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current() is not None:
+                return func(*args, **kwargs)
+            begin_rerun(kind)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end_rerun()
+        return wrapper
+    return decorator
+
+
+def render_debug_panel() -> None:
+    """사이드바에 최근 재실행 기록을 보여 줍니다. 계측이 꺼져 있으면 아무것도 그리지 않습니다."""
+    history = st.session_state.get("perf_history")
+    if not is_enabled() or not history:
+        return
+    with st.sidebar.expander(f"⏱️ 성능 계측 (최근 {len(history)}회)"):
+        rows = []
+        for record in reversed(history):
+            slowest = sorted(record["spans"].items(), key=lambda item: item[1]["ms"], reverse=True)[:3]
+            rows.append({
+                "종류": record["kind"],
+                "전체(ms)": record["total_ms"],
+                "주요 구간": ", ".join(f"{name} {v['ms']:.0f}ms" for name, v in slowest),
+                "카운터": ", ".join(f"{k}={v}" for k, v in sorted(record["counters"].items())),
+            })
+        st.dataframe(rows, hide_index=True)
@@ -0,0 +1,33 @@
+"""
+산호초 백화현상 퀴즈 문제 목록
+- 이미지는 원본 URL 로 적어 두고, 화면에는 assets.py 가 만든 로컬 사본(콘텐츠 해시 파일명)을 사용합니다.
+- 이미지를 미리 받아 두려면: $ python assets.py
+"""
+
+# 문제와 정답 (이미지 URL 사용)
+QUIZ = [
+    {
+        "question": "1. 이 산호의 상태는 무엇일까요?",
+        "image": "https://cdn.greenpostkorea.co.kr/news/photo/201704/75294_62473_art_1491801757.jpg",  # 정상 산호 이미지
+        "options": ["정상", "백화", "죽은 산호", "조류 과다"],
+        "answer": "백화"
+    },
+    {
+        "question": "2. 산호초 백화현상의 주요 원인은 무엇일까요?",
+        "image": None,
+        "options": ["해수온 상승", "조류 활동 증가", "바닷물 염도 감소", "산소 과다"],
+        "answer": "해수온 상승"
+    },
+    {
+        "question": "3. 산호초가 건강할 때 주로 공생하는 생물은 무엇인가요?",
+        "image": None,
+        "options": ["조류(산호 조류)", "해파리", "상어", "펭귄"],
+        "answer": "조류(산호 조류)"
+    },
+    {
+        "question": "4. 백화된 산호초를 보호하기 위해 할 수 있는 활동으로 적절한 것은?",
+        "image": None,
+        "options": ["해수온 조절", "해양 오염 감소", "산호 채집", "인공 조류 제거"],
+        "answer": "해수온 조절"
+    }
+]
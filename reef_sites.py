@@ -0,0 +1,180 @@
+"""
+산호초 지점 단위 자료와 공간 집계(binning)
+- 지점마다 (위도, 경도, 국가, 지점 편차)를 한 번만 만들어 두고 모든 세션이 공유합니다.
+- 연도별 지점 지수 = 해당 국가의 연평균(집계 인덱스) + 지점 편차 이므로 연도마다 자료를 다시 만들지 않습니다.
+- 지도에는 원 지점 대신 보이는 영역을 격자/육각형 칸으로 나눈 집계만 보냅니다.
+  칸 크기는 확대 수준에 따라 정해지므로 지점이 몇 개든 칸 수는 GRID_COLUMNS² / 2 안팎으로 제한됩니다.
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import streamlit as st
+
+import perf
+from aggregates import load_aggregate_index
+from data_layer import CACHE_MAX_ENTRIES, DATA_SEED
+
+# 예시 산호초 지점 수. CORAL_SITE_COUNT 로 바꿀 수 있습니다.
+SITE_COUNT = int(os.environ.get("CORAL_SITE_COUNT", "1000000"))
+SITE_OFFSET_STD = 8.0
+
+# 국가별 산호초 분포: (중심 경도, 중심 위도), (경도 폭, 위도 폭), 지점 비율
+REEF_REGIONS = {
+    "대한민국": ((126.6, 33.4), (0.8, 0.4), 0.02),
+    "호주": ((147.5, -18.5), (3.0, 5.0), 0.30),
+    "인도네시아": ((120.0, -4.0), (8.0, 3.0), 0.30),
+    "필리핀": ((122.5, 11.0), (2.5, 3.0), 0.15),
+    "일본": ((127.8, 26.3), (1.5, 1.0), 0.08),
+    "몰디브": ((73.3, 3.5), (0.4, 2.0), 0.05),
+    "미국 하와이": ((-157.0, 20.7), (1.5, 0.8), 0.10),
+}
+
+# '전 지구'를 확대할 때의 중심: 산호초가 가장 많이 모인 인도-태평양 산호 삼각지대
+GLOBAL_CENTER = (130.0, 0.0)
+
+# 확대 수준: 0 은 전 지구(경도 360도), 한 단계마다 보이는 폭이 절반이 됩니다.
+MAX_ZOOM = 5
+# 보이는 폭을 몇 칸으로 나눌지. 화면으로 보내는 칸 수의 상한을 정합니다.
+GRID_COLUMNS = 72
+
+
+@dataclass(frozen=True)
+class ReefSites:
+    """산호초 지점 배열 (모두 읽기 전용)."""
+
+    lon: np.ndarray
+    lat: np.ndarray
+    country: np.ndarray  # REEF_REGIONS 순서의 국가 번호
+    offset: np.ndarray
+
+    def values(self, version: str, year: int) -> np.ndarray:
+        """해당 연도의 지점별 백화현상 지수. 국가 자료가 없는 연도는 NaN."""
+        index = load_aggregate_index(version)
+        year_mean = index.year_means(year)
+        means = np.full(len(REEF_REGIONS), np.nan, dtype=np.float32)
+        for code, name in enumerate(REEF_REGIONS):
+            column = index.column(name)
+            if column is not None:
+                means[code] = year_mean[column]
+        return np.clip(means[self.country] + self.offset, 0, 100)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_reef_sites(version: str, seed: int = DATA_SEED) -> ReefSites:
+    """예시 산호초 지점. 국가별 산호초 분포를 따라 고정 시드로 만듭니다.
+
+    CRW 자료에는 지점 단위 값이 없으므로, 어떤 데이터 버전이든 위치와 편차는 예시로 만들고
+    국가별 연평균만 해당 버전의 집계 인덱스에서 가져옵니다.
+    """
+    perf.cache_miss("reef_sites")
+    rng = np.random.default_rng(seed)
+    weights = np.array([w for _, _, w in REEF_REGIONS.values()])
+    country = rng.choice(len(REEF_REGIONS), size=SITE_COUNT, p=weights / weights.sum()).astype(np.int8)
+    centers = np.array([c for c, _, _ in REEF_REGIONS.values()], dtype=np.float32)
+    spreads = np.array([s for _, s, _ in REEF_REGIONS.values()], dtype=np.float32)
+    points = centers[country] + rng.standard_normal((SITE_COUNT, 2), dtype=np.float32) * spreads[country]
+
+    sites = ReefSites(
+        lon=np.clip(points[:, 0], -180, 180),
+        lat=np.clip(points[:, 1], -90, 90),
+        country=country,
+        offset=rng.normal(0, SITE_OFFSET_STD, SITE_COUNT).astype(np.float32),
+    )
+    for array in (sites.lon, sites.lat, sites.country, sites.offset):
+        array.flags.writeable = False
+    perf.count("rows.reef_sites", SITE_COUNT)
+    return sites
+
+
+def viewport(region: str, zoom: int) -> tuple[float, float, float, float]:
+    """(서, 동, 남, 북) 경계. 국가를 고르면 그 나라 산호초 분포의 중심에 맞춥니다."""
+    zoom = min(max(zoom, 0), MAX_ZOOM)
+    width, height = 360 / 2 ** zoom, 180 / 2 ** zoom
+    center_lon, center_lat = REEF_REGIONS[region][0] if region in REEF_REGIONS else GLOBAL_CENTER
+    west = min(max(center_lon - width / 2, -180), 180 - width)
+    south = min(max(center_lat - height / 2, -90), 90 - height)
+    return west, west + width, south, south + height
+
+
+def _grid_cells(lon: np.ndarray, lat: np.ndarray, size: float) -> tuple[np.ndarray, np.ndarray]:
+    return np.floor(lon / size).astype(np.int64), np.floor(lat / size).astype(np.int64)
+
+
+def _grid_centers(i: np.ndarray, j: np.ndarray, size: float) -> tuple[np.ndarray, np.ndarray]:
+    return (i + 0.5) * size, (j + 0.5) * size
+
+
+def _hex_cells(lon: np.ndarray, lat: np.ndarray, size: float) -> tuple[np.ndarray, np.ndarray]:
+    """꼭짓점이 위를 향하는 육각형의 축 좌표 (q, r). size 는 중심에서 꼭짓점까지 거리."""
+    q = (np.sqrt(3) / 3 * lon - lat / 3) / size
+    r = (2 / 3 * lat) / size
+    # 세제곱 좌표 반올림: 반올림 오차가 가장 큰 축을 나머지 두 축으로 다시 맞춥니다.
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int64), rr.astype(np.int64)
+
+
+def _hex_centers(q: np.ndarray, r: np.ndarray, size: float) -> tuple[np.ndarray, np.ndarray]:
+    return size * np.sqrt(3) * (q + r / 2), size * 1.5 * r
+
+
+# 이름 → (칸 번호 계산, 칸 중심 계산, 보이는 폭 대비 칸 크기 비율)
+BINNERS = {
+    "육각형": (_hex_cells, _hex_centers, 1 / (GRID_COLUMNS * np.sqrt(3))),
+    "격자": (_grid_cells, _grid_centers, 1 / GRID_COLUMNS),
+}
+
+
+@dataclass(frozen=True)
+class SiteBins:
+    """보이는 영역의 칸별 집계. 지점이 있는 칸만 담습니다."""
+
+    lon: np.ndarray
+    lat: np.ndarray
+    count: np.ndarray
+    mean: np.ndarray
+    bounds: tuple[float, float, float, float]
+    cell_size: float
+    total: int
+
+
+def bin_sites(version: str, year: int, region: str, zoom: int, method: str = "육각형") -> SiteBins:
+    """보이는 영역 안의 지점을 칸별 (개수, 평균 지수) 로 묶습니다."""
+    sites = load_reef_sites(version)
+    values = sites.values(version, year)
+    west, east, south, north = bounds = viewport(region, zoom)
+    inside = (sites.lon >= west) & (sites.lon <= east) & (sites.lat >= south) & (sites.lat <= north) & ~np.isnan(values)
+    lon, lat, values = sites.lon[inside], sites.lat[inside], values[inside]
+    perf.count("rows.site_binning", len(values))
+
+    to_cells, to_centers, ratio = BINNERS[method]
+    size = (east - west) * ratio
+    a, b = to_cells(lon, lat, size)
+    if len(values) == 0:
+        empty = np.empty(0)
+        return SiteBins(empty, empty, empty.astype(np.int64), empty, bounds, size, 0)
+
+    # 보이는 영역이 제한되어 있으므로 칸 번호 범위도 작습니다. 정렬 없이 bincount 로 묶습니다.
+    a0, b0 = a.min(), b.min()
+    height = int(b.max() - b0) + 1
+    flat = (a - a0) * height + (b - b0)
+    counts = np.bincount(flat)
+    sums = np.bincount(flat, weights=values)
+    occupied = np.flatnonzero(counts)
+    centers_lon, centers_lat = to_centers(occupied // height + a0, occupied % height + b0, size)
+    return SiteBins(
+        lon=centers_lon,
+        lat=centers_lat,
+        count=counts[occupied],
+        mean=sums[occupied] / counts[occupied],
+        bounds=bounds,
+        cell_size=size,
+        total=len(values),
+    )
@@ -5,13 +5,20 @@ Streamlit 대시보드 (한국어 UI)
 - '백화현상 지수' 탭에 새로운 시각화 기능을 추가했습니다.
 """
 
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import streamlit as st
-import streamlit.components.v1 as components
 import datetime
-import pytz
+import functools
+
+import streamlit as st
+
+import content
+import perf
+from constants import COUNTRIES, DEFAULT_DATE, END_DATE, START_DATE
+from quiz_bank import QUIZ
+
+# pandas/numpy/pyarrow/plotly 와 이를 쓰는 모듈은 탭과 fragment 안에서 처음 필요할 때 불러옵니다.
+# 첫 실행은 제목·사이드바·탭을 먼저 보낸 뒤 무거운 라이브러리를 불러오고,
+# 메인 탭을 열지 않는 세션(보고서·뉴스·퀴즈)은 끝까지 불러오지 않습니다.
+# 한 번 불러온 모듈은 프로세스 전체가 공유하므로 이후 실행의 import 문은 사전 조회뿐입니다.
 
 # ---------------------------
 # 페이지 설정 및 스타일
@@ -21,18 +28,11 @@ st.set_page_config(
     layout="wide"
 )
 
-st.markdown("<h1 style='color:black;'>🌊 산호초 백화현상 & 해수 온도 대시보드</h1>", unsafe_allow_html=True)
-st.markdown("<p style='color:black; font-size: 16px; font-weight: bold;'>😍 해수온이 올라가면 산호가 조말루치라는 조류를 잃어 ‘백화 현상’이 일어납니다. 산호는 색을 잃고 영양도 제대로 얻지 못해 약해집니다. 지구 온난화, 이상 기후, 오염 등이 원인이며, 백화가 오래 지속되면 산호와 그곳에 사는 해양 생물들 모두 위험해집니다. ❤️‍🩹</p>", unsafe_allow_html=True)
-
-# ---------------------------
-# 유틸리티: 시간/로컬 날짜 처리
-# ---------------------------
-LOCAL_TZ = pytz.timezone("Asia/Seoul")
-
-def local_today_date() -> pd.Timestamp:
-    return pd.Timestamp.now(tz=LOCAL_TZ).normalize()
+# 계측(CORAL_PERF=1 또는 ?debug=1)이 켜져 있을 때만 단계별 시간을 모읍니다.
+perf.begin_rerun()
 
-TODAY = local_today_date().date()
+st.markdown(content.TITLE_HTML, unsafe_allow_html=True)
+st.markdown(content.INTRO_HTML, unsafe_allow_html=True)
 
 # ---------------------------
 # 사이드바 필터
@@ -40,60 +40,183 @@ TODAY = local_today_date().date()
 with st.sidebar:
     st.header("필터")
 
-    start_date = datetime.date(1980, 1, 1)
-    end_date = datetime.date(2020, 8, 31)
-    
-    selected_date = st.date_input(
-        "날짜 선택",
-        datetime.date(2000, 1, 1),
-        min_value=start_date,
-        max_value=end_date
-    )
-    
-    countries = ["전 지구", "대한민국", "호주", "인도네시아", "필리핀", "일본", "몰디브", "미국 하와이"]
+    # 날짜 선택은 지도 칼럼(fragment) 안에 있습니다. 날짜를 바꾸면 지도만 다시 그립니다.
+    countries = COUNTRIES
     selected_country = st.selectbox("나라 선택", countries)
 
+# ---------------------------
+# 지도 칼럼: 날짜를 바꿔도 이 부분만 다시 실행됩니다
+# ---------------------------
+@st.fragment
+@perf.fragment_scope("map")
+def render_map_column():
+    from data_layer import data_version
+    from map_view import MAP_LEVELS, build_choropleth, build_choropleth_animation, build_site_map
+    from reef_sites import BINNERS, MAX_ZOOM
+
+    st.subheader("🌎 지도에서 보는 국가별 백화현상")
+    map_level = st.radio("지도 단위", MAP_LEVELS, key="map_level", horizontal=True, persist_state="session")
+    if map_level == "국가별" and st.toggle(
+        "연도 애니메이션", key="map_animation", help="모든 연도를 한 번에 받아 브라우저에서 재생합니다.", persist_state="session"
+    ):
+        with perf.cached("choropleth_animation"):
+            fig_map = build_choropleth_animation(data_version())
+    else:
+        selected_date = st.date_input(
+            "날짜 선택",
+            value=DEFAULT_DATE,
+            min_value=START_DATE,
+            max_value=END_DATE,
+            key="selected_date",
+            persist_state="session",
+        )
+        if map_level == "국가별":
+            with perf.cached("choropleth"):
+                fig_map = build_choropleth(data_version(), selected_date.year)
+        else:
+            # 사이드바에서 고른 나라의 산호초 분포를 중심으로 확대합니다 ('전 지구'는 전체).
+            zoom = st.slider("확대 수준", 0, MAX_ZOOM, key="site_zoom", help="확대할수록 더 작은 칸으로 묶습니다.", persist_state="session")
+            method = st.radio("묶는 방식", list(BINNERS), key="site_binning", horizontal=True, persist_state="session")
+            with perf.cached("site_map"):
+                fig_map = build_site_map(data_version(), selected_date.year, selected_country, zoom, method)
+    with perf.span("emit.map"):
+        st.plotly_chart(fig_map, width="stretch")
+    render_export_panel()
+
+# ---------------------------
+# 필터된 일별 자료 내려받기: 버튼을 누를 때만 파일을 만듭니다
+# ---------------------------
+def render_export_panel():
+    from data_layer import data_version
+    from export import FORMATS, export_bytes, file_name, mime_type
+
+    # 연도 애니메이션 중에는 날짜 선택이 화면에 없으므로 마지막으로 고른 날짜(없으면 기본값)를 씁니다.
+    selected_date = st.session_state.get("selected_date", DEFAULT_DATE)
+    with st.expander("📥 필터된 자료 내려받기"):
+        scope = st.radio("기간", ["선택한 연도", "전체 기간"], key="export_scope", horizontal=True, persist_state="session")
+        fmt = st.radio("형식", list(FORMATS), key="export_format", horizontal=True, persist_state="session")
+        compressed = st.checkbox(
+            "압축", key="export_compressed", help="CSV 는 gzip, Parquet 은 zstd 로 압축합니다.", persist_state="session"
+        )
+        year = selected_date.year if scope == "선택한 연도" else None
+        st.download_button(
+            f"{selected_country} · {year or '전체 기간'} 일별 자료 ({fmt})",
+            data=functools.partial(export_bytes, data_version(), selected_country, year, fmt, compressed),
+            file_name=file_name(selected_country, year, fmt, compressed),
+            mime=mime_type(fmt, compressed),
+            on_click="ignore",
+            key="export_download",
+        )
+
+# ---------------------------
+# 해수온/DHW 와 백화현상 지수의 상관 분석: 지표를 바꿔도 이 부분만 다시 실행됩니다
+# ---------------------------
+@st.fragment
+@perf.fragment_scope("correlation")
+def render_correlation_section():
+    from correlation import DRIVERS, build_lag_figure, build_rolling_figure, lag_frame
+    from data_layer import data_version
+
+    st.subheader("🌡️ 해수온과 백화현상의 상관관계")
+    driver = st.radio("지표", list(DRIVERS), key="corr_driver", horizontal=True, persist_state="session")
+    # 사이드바의 나라와 추세 차트의 표시 구간을 그대로 따릅니다 (연도별 해상도에서는 마지막 구간 또는 전체 기간).
+    view_start, view_end = st.session_state.get("trend_window", (START_DATE, END_DATE))
+    with perf.cached("rolling_figure"):
+        fig_rolling = build_rolling_figure(data_version(), driver, selected_country, view_start, view_end)
+    with perf.cached("lag_figure"):
+        fig_lag = build_lag_figure(data_version(), driver, selected_country)
+        df_lag = lag_frame(data_version(), driver, selected_country)
+
+    col_rolling, col_lag = st.columns(2)
+    with col_rolling:
+        st.plotly_chart(fig_rolling, width="stretch")
+    with col_lag:
+        st.plotly_chart(fig_lag, width="stretch")
+        if df_lag["상관계수"].notna().any():
+            peak = df_lag.loc[df_lag["상관계수"].idxmax()]
+            st.caption(f"{driver}가 {int(peak['시차(일)'])}일 앞설 때 상관계수가 가장 높습니다 (r = {peak['상관계수']:.2f}).")
+
+# ---------------------------
+# 뉴스 기사 미리보기 카드 (전체 페이지 iframe 대신 캐시된 제목/첫 문단/썸네일)
+# ---------------------------
+def render_article_card(url: str):
+    from news_preview import get_preview, is_fetching, thumbnail_path
+
+    with perf.span("news_preview"):
+        preview = get_preview(url)
+    if preview is None:
+        if is_fetching(url):
+            render_pending_article(url)
+            return
+        st.error("뉴스 기사 미리보기를 불러오는 데 실패했습니다.")
+        st.markdown(f"**직접 방문하기:** [{url}]({url})")
+        return
+
+    with st.container(border=True):
+        thumbnail = thumbnail_path(preview)
+        if thumbnail is not None:
+            col_image, col_text = st.columns([1, 2])
+            col_image.image(str(thumbnail), width="stretch")
+        else:
+            col_text = st.container()
+        with col_text:
+            st.markdown(f"#### [{preview.title}]({url})")
+            if preview.lead:
+                st.write(preview.lead)
+            st.link_button("기사 전문 보기", url)
+
+# 미리보기를 백그라운드에서 가져오는 동안 원문 링크를 보여 주고, 이 부분만 1초마다 확인합니다.
+# 다 가져오면 앱을 한 번 다시 실행해 카드를 그리며, 그 뒤로는 이 fragment 가 실행되지 않으므로 확인도 멈춥니다.
+@st.fragment(run_every="1s")
+@perf.fragment_scope("news")
+def render_pending_article(url: str):
+    from news_preview import is_fetching
+
+    if not is_fetching(url):
+        st.rerun()
+    st.info("기사 미리보기를 가져오는 중입니다. 그동안 아래 링크로 원문을 볼 수 있습니다.")
+    st.markdown(f"**직접 방문하기:** [{url}]({url})")
+
 # ---------------------------
 # Streamlit 앱 UI 구성
 # ---------------------------
-# 메인 콘텐츠 (탭으로 구성)
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["메인", "보고서", "한겨레 뉴스", "플래닛 03 뉴스", "퀴즈"])
+# 메인 콘텐츠 (탭으로 구성) — 각 탭은 함수로 두고, 아래 탭 라우터가 선택된 탭만 실행합니다.
+def render_main_tab():
+    import streamlit.components.v1 as components
 
-with tab1:
     st.subheader("Allen Coral Atlas (앨런 산호 지도)")
     embed_url = "https://allencoralatlas.org/atlas/#1.00/37.1744/-176.4983"
     try:
-        components.html(
-            f'<iframe src="{embed_url}" width="100%" height="850px" style="border:none;"></iframe>',
-            height=870,
-            scrolling=True
-        )
+        with perf.span("emit.atlas_iframe"):
+            components.html(
+                f'<iframe src="{embed_url}" width="100%" height="850px" style="border:none;"></iframe>',
+                height=870,
+                scrolling=True
+            )
     except Exception as e:
         st.error(f"웹페이지를 불러오는 데 실패했습니다: {e}")
         st.info("해당 웹사이트가 iframe 임베딩을 허용하지 않거나, 일시적인 오류일 수 있습니다.")
         st.markdown(f"**직접 방문하기:** [{embed_url}]({embed_url})")
     st.markdown("---")
 
+    # 지도 iframe 이 먼저 전송된 뒤 차트에 필요한 라이브러리를 불러옵니다 (프로세스의 첫 실행에서만 시간이 듭니다).
+    with perf.span("import.main"):
+        import plotly.express as px
+
+        from aggregates import load_aggregate_index
+        from data_layer import data_version
+        from timeseries import RESOLUTIONS, query_series
+
     # ----- 백화현상 지수 탭에서 이동된 내용 -----
     
     # —————————————
-    # 가짜 데이터 생성 (예시)
-    # —————————————
-    dates = pd.date_range("1980-01-01", "2020-08-31", freq="Y")
-    data = {
-        "날짜": np.tile(dates, len(countries)),
-        "나라": np.repeat(countries, len(dates)),
-        "백화현상지수": np.random.rand(len(dates) * len(countries)) * 100
-    }
-    df = pd.DataFrame(data)
-    
-    # —————————————
-    # 선택된 나라 데이터 필터링
+    # 선택된 나라 데이터 — NOAA CRW Parquet 이 적재되어 있으면 그 자료를, 없으면 예시 데이터를 사용합니다
     # —————————————
-    if selected_country == "전 지구":
-        df_filtered = df.groupby("날짜")["백화현상지수"].mean().reset_index()
-    else:
-        df_filtered = df[df["나라"] == selected_country]
+    # 연도 × 국가 집계 인덱스는 데이터 버전마다 한 번만 만들어지며, 차트와 지도는 배열 조회만 합니다.
+    with perf.cached("aggregate_index"):
+        agg_index = load_aggregate_index(data_version())
+    with perf.span("trend.lookup"):
+        df_filtered = agg_index.trend(selected_country)
     
     # ---------------------------
     # 컬럼을 사용하여 차트를 나란히 배치
@@ -102,246 +225,97 @@ with tab1:
     
     with col1:
         st.subheader("📊 연도별 백화현상 지수 변화")
-        fig_line = px.line(df_filtered, x="날짜", y="백화현상지수", title=f"{selected_country} 백화현상 추세")
-        st.plotly_chart(fig_line, use_container_width=True)
+        resolution = st.radio("해상도", RESOLUTIONS, horizontal=True, key="trend_resolution", persist_state="session")
+        if resolution == "연도별":
+            df_trend = df_filtered
+        else:
+            # 일별/월별은 표시 구간만 원해상도로 다시 조회하고, 차트 폭에 맞게 줄여서 보냅니다.
+            view_start, view_end = st.slider(
+                "표시 구간",
+                min_value=START_DATE,
+                max_value=END_DATE,
+                value=(START_DATE, END_DATE),
+                format="YYYY-MM-DD",
+                key="trend_window",
+                persist_state="session",
+            )
+            with perf.span("trend.query"):
+                df_trend = query_series(data_version(), selected_country, resolution, view_start, view_end)
+        with perf.span("px.line"):
+            fig_line = px.line(df_trend, x="날짜", y="백화현상지수", title=f"{selected_country} 백화현상 추세")
+        with perf.span("emit.line"):
+            st.plotly_chart(fig_line, width="stretch")
+        perf.count("rows.trend_points", len(df_trend))
     
     with col2:
-        st.subheader("🌎 지도에서 보는 국가별 백화현상")
-        latest_year = selected_date.year
-        df_map = df[df["날짜"].dt.year == latest_year]
-    
-        country_map = {
-            "대한민국": "South Korea",
-            "호주": "Australia",
-            "인도네시아": "Indonesia",
-            "필리핀": "Philippines",
-            "일본": "Japan",
-            "몰디브": "Maldives",
-            "미국 하와이": "United States",
-            "전 지구": "World"
-        }
-        df_map["country_en"] = df_map["나라"].map(country_map)
+        render_map_column()
     
-        fig_map = px.choropleth(
-            df_map,
-            locations="country_en",
-            locationmode="country names",
-            color="백화현상지수",
-            title=f"{latest_year}년 국가별 산호초 백화현상 지수",
-            color_continuous_scale="Reds"
-        )
-        st.plotly_chart(fig_map, use_container_width=True)
+    render_correlation_section()
     
     st.markdown("---")
     
-    st.markdown(
-        """
-        ### 📚 종합 보고서: 백화된 산호초와 지구 온난화
-        
-        <div style="font-size: medium;">
-        <br>
-        <b>📖 데이터 출처 및 참고 자료</b>
-        <ul>
-            <li>공식 해수면 데이터: NOAA Sea Level Change Portal / Allen Coral Atlas</li>
-            <li>뉴스 출처:
-                <ul>
-                    <li>한겨레 뉴스 '산호가 보내는 SOS' 기사</li>
-                    <li>플래닛 03 뉴스 '식량위기, 바다가 보내는 경고' 기사</li>
-                </ul>
-            </li>
-        </ul>
-
-        <b>🌍 주요 연구 결과 및 시사점</b>
-        <ul>
-            <li><b>주요 연구 결과</b><br>
-                <ul>
-                    <li>해수온이 평년보다 1~2℃ 이상 상승하면 산호초 백화 현상 발생</li>
-                    <li>해수온과 백화 현상 간의 상관관계 확인</li>
-                    <li>해수온 상승이 산호 생태계 붕괴의 핵심 원인임을 보여줌</li>
-                    <li>백화 현상이 지속되면 산호는 죽게됨</li>
-                </ul>
-            </li>
-            <li><b>해양 생태계에 미치는 영향</b><br>
-                <ul>
-                    <li>전 세계 약 25%의 해양 생물의 서식지 파괴</li>
-                    <li>생물 다양성 위협</li>
-                    <li>어업 자원 감소, 관광 산업 위축, 해안 침식등의 사회경제적 손실</li>
-                </ul>
-            </li>
-            <li><b>시사점 및 실천 방안</b><br>
-                <ul>
-                    <li>온실가스 배출량 줄여 기후 변화 늦추기</li>
-                    <li>해양 오염도 원인이 되므로 이에 대한 노력 필요</li>
-                    <li>사람들의 행동 변화를 이끌어 내야함</li>
-                </ul>
-            </li>
-        </ul>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    
-    st.markdown("<br><b>💡 해결 방안 및 실천 과제</b>", unsafe_allow_html=True)
-    st.markdown(
-        """
-        <div style="font-size: medium;">
-            <b>1. 온실가스 배출량 줄이기</b>
-            <ul>
-                <li>자가용 보다 대중교통 이용하기</li>
-                <li>자전거 타고 이동하기</li>
-                <li>불을 끄거나 어댑터를 뽑아 안 쓰는 전기 절약하기</li>
-                <li>에너지 소비 효율 좋은 제품 사용하기</li>
-            </ul>
-            <b>2. 환경 개선하기</b>
-            <ul>
-                <li>플라스틱 사용 줄이기</li>
-                <li>해양 봉사활동 (쓰레기 줍기)</li>
-            </ul>
-            <b>3. 인식 개선</b>
-            <ul>
-                <li>환경 교육과 캠페인</li>
-                <li>SNS, TV 광고 등을 통한 문제 알리기</li>
-            </ul>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    
-    st.markdown(
-        """
-    ---
-    <br>
-    <p style='color:black; font-weight:bold;'>⚠️ 연구의 한계 및 주의사항</p>
-    <p>이 대시보드의 일부 데이터는 교육 및 시각화 목적의 시뮬레이션을 포함하고 있습니다. 실제 학술 연구나 정책 결정에는 다음의 공식 데이터를 활용하시기 바랍니다:</p>
-    <br>
-    <ul>
-        <li><a href="https://allencoralatlas.org/atlas/#4.55/-15.4730/149.1687" target="_blank">Allen Coral Atlas</a></li>
-        <li><a href="https://kosis.kr/index/index.do" target="_blank">국가통계포털(KOSIS)</a></li>
-    </ul>
-    """,
-    unsafe_allow_html=True
-    )
+    st.markdown(content.MAIN_REPORT_HTML, unsafe_allow_html=True)
+    st.markdown(content.SOLUTIONS_TITLE_HTML, unsafe_allow_html=True)
+    st.markdown(content.SOLUTIONS_HTML, unsafe_allow_html=True)
+    st.markdown(content.LIMITS_HTML, unsafe_allow_html=True)
 
     st.markdown("---")
 
-    st.markdown("""
-    <div style="text-align: center; font-size: large; font-weight: bold;">
-    <br>
-    <p>우리는 마치 끓는 물 속의 개구리입니다. 서서히 변화하는 위험을 인지하지 못하고 현실에 안주하고 있으니 말입니다. 지금 이 시간에도 지구 온난화로 인해 바다 속부터 변화가 일어나고 있습니다. 하지만 정해진 결말이라 단정짓고 포기할 이유는 없습니다. 사소한 행동을 모으고, 쌓아서 다른 미래를 만들어갈 가능성을 가진 것이 사람이니까요. 그러니 지금부터라도 하나씩 도전해보는건 어떨까요?</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(content.CLOSING_HTML, unsafe_allow_html=True)
 
 
-with tab2:
+def render_report_tab():
     st.subheader("지구 온난화와 산호초 백화 현상에 관한 보고서")
     
-    st.markdown("""
-지구 온난화로 인한 해수온 상승은 생태계 전반에 심각한 영향을 미치고 있으며, 그중에서도 산호초 백화 현상은 가장 대표적이고 우려되는 문제로 지적되고 있습니다. 산호초는 해양 생물의 약 25%가 서식하는 중요한 생태계로서, 생물 다양성과 생산성을 유지하는 핵심적 역할을 수행합니다. 그러나 해수온이 일정 수준 이상으로 상승하면 산호의 색소가 소실되고, 장기적으로는 산호 사멸로 이어지는 백화 현상이 발생합니다.
-
-이러한 산호초의 붕괴는 어업 자원의 감소, 연안 지역의 해양 관광 산업 위축, 해안 방파 효과 상실 등 다양한 사회/경제적 피해를 초래할 수 있습니다. 특히 전 지구적으로 산호초가 빠른 속도로 감소하고 있다는 점은 인류의 지속 가능한 발전에도 직접적인 위협으로 작용합니다. 따라서 단순히 해수온 상승이라는 단일 요인에 그치지 않고, 해양 산성화, 수질 오염, 빛과 영양염류 조건 등 다양한 환경적 요인이 복합적으로 작용할 수 있음을 고려해야 합니다. 이에 본 보고서는 해수온 상승으로 인한 산호초 백화 현상의 원인을 체계적으로 탐구하고, 이를 통해 효과적인 보존 및 관리 방안을 마련하는 데 기초 자료를 제공하고자 합니다.
-
----
-
-### 해수온 상승과 산호초 백화 현상 간의 상관관계
-
-미국해양대기청(NOAA)의 자료에 따르면, 열대 태평양, 인도양, 카리브 해역 등 주요 산호초 분포 지역에서 해수면 온도가 꾸준히 상승하고 있으며, 특정 시기에는 급격한 고온 현상이 관측되었습니다. 이러한 변화는 대규모 백화 사건과 밀접하게 연결되는데, 실제로 1998년과 2016년에 발생한 전 지구적 백화 현상은 평균 해수온이 평년보다 1~2℃ 높게 유지된 시기와 일치합니다. 이는 해수온 변화 추이가 산호초 백화 현상의 발생 시기와 강도를 설명하는 중요한 지표임을 보여줍니다. 더 나아가 자료 분석 결과, 해수온 상승과 산호초 백화 현상 사이에는 뚜렷한 상관관계가 확인됩니다. 해수온이 임계 수준(약 30℃ 전후)을 초과하거나 평년 대비 1℃ 이상의 고온이 일정 기간 지속될 경우, 산호는 공생조류를 방출하며 급격히 백화됩니다. NOAA 지도의 시각적 증거 역시 이를 뒷받침하는데, 해수온이 높은 지역일수록 산호초의 백화 피해가 집중되는 양상이 뚜렷하게 나타났습니다. 따라서 해수온 상승은 단순한 기후 지표를 넘어, 산호 생태계 붕괴를 직접적으로 설명하는 핵심 요인으로 이해할 수 있습니다.
-
-바다의 온도가 상승할수록 산호초의 백화현상도 빠르게 진행됩니다. 밑은 2016년 부터 2017년까지 1년 동안의 산호초 변화 현상입니다.
-
-그렇다면 바다 온도와 산호초는 실제로 어떤 관련이 있을까요? 결론부터 말하자면, 밀접한 연관이 있습니다. 산호초는 산호충의 석회질 외골격이 오랜 세월 쌓여 형성된 암초로, 전 세계 해양 생물의 약 25%가 서식하는 중요한 생태계입니다. 겉보기에 식물처럼 보이지만 실제로는 촉수를 이용해 먹이를 잡는 동물입니다. 산호는 체내에 공생 조류(조류의 일종인 ‘조류성 미세조류, 조산소를 가지고 있는데, 이 미세조류가 광합성을 통해 산호에게 에너지를 공급합니다. 하지만 바다의 수온이 평소보다 1~2℃ 이상 오르면, 산호는 스트레스를 받아 이 공생 조류를 몸 밖으로 내쫓게 됩니다. 그 결과 산호는 에너지원과 색을 잃어 흰색으로 변하는데, 이것이 바로 산호초 백화현상입니다. 이 현상이 중요한 이유는 단순히 산호의 죽음 때문만이 아닙니다. 산호초는 바다 생태계의 ‘집’이자 ‘어머니’라 불릴 만큼 수많은 해양 생물이 의존하는 터전이기 때문입니다. 작은 물고기들은 산호초를 은신처로 삼고, 갑각류와 말미잘 같은 무척추동물도 산호에 붙어 살아갑니다. 실제로 연구에 따르면, 건강한 산호초는 해양 생물 다양성을 유지하는 핵심 기반이며, 인간에게도 어업과 해안 보호(방파제 역할), 관광 자원을 제공합니다. 하지만 백화현상이 심해지면 산호는 회복하지 못하고 죽게 됩니다. 산호가 사라지면 해양 생물들의 서식지가 붕괴되고, 이는 곧 생태계 균형의 붕괴로 이어집니다. 예를 들어 2016년 호주 그레이트 배리어 리프에서는 해수 온도 상승으로 전체 산호초의 약 30% 이상이 백화되었으며, 일부 지역은 사실상 회복 불가능한 상태에 이르렀습니다. 즉, 산호초 백화현상은 단순히 바닷속 풍경이 사라지는 문제가 아니라, 지구 해양 생태계 전체의 위기와 직결된 현상이라 할 수 있습니다.
+    st.markdown(content.REPORT_MARKDOWN, unsafe_allow_html=True)
 
----
-
-### 우리의 실천 방안
-
-우리는 산호초 백화현상이 줄어들 수 있도록 노력해야 합니다. 적어도 이 상황이 악화되지 않도록 노력 해야 합니다. 그렇다면 어떤 실천 방법을 실천할 수 있을까요?
-
-<ul style="list-style-type:none;">
-    <li><b>온실가스 배출량 줄이기</b>: 자가용보다 대중교통 이용하기, 자전거 타고 이동하기, 안 쓰는 전기 절약하기, 에너지 효율 좋은 제품 사용하기.</li>
-    <li><b>플라스틱 사용 줄이기</b>: 바다 쓰레기의 약 70%가 플라스틱입니다. 플라스틱 사용을 줄이거나 해양 봉사활동을 통해 쓰레기 유입을 줄이는 것도 좋은 방법입니다.</li>
-    <li><b>환경 교육과 캠페인</b>: 학교에서 진행되는 환경 교육과 캠페인을 좀 더 사실적이고 심각성이 보이게 교육할 필요가 있습니다. 의무적인 교육이 아닌, 실제로 변화를 만들어낼 수 있는 교육이 필요합니다.</li>
-</ul>
-
-이러한 방법들은 모두 실천하기 쉽지만 그만큼 가볍게 생각하게 되는 사소한 방법입니다. 하지만 이 사소한 행동들이 모여 거대한 하나를 만들고 그 거대한 하나가 세상을 바꾸는 것입니다. 사소한 실천을 같이 수업시간에 해보거나 봉사활동으로 참여하는 것도 좋은 방법이라고 생각합니다.
-    """, unsafe_allow_html=True)
-
-with tab3:
+def render_hani_tab():
     st.subheader("한겨레: '산호가 보내는 SOS' 기사")
     hani_url = "https://www.hani.co.kr/arti/society/environment/1194115.html"
-    st.info("아래 기사는 한겨레 웹사이트에서 제공됩니다.")
-    try:
-        components.html(
-            f'<iframe src="{hani_url}" width="100%" height="800px" style="border:none;"></iframe>',
-            height=820,
-            scrolling=True
-        )
-    except Exception as e:
-        st.error(f"뉴스 기사를 불러오는 데 실패했습니다: {e}")
-        st.markdown(f"**직접 방문하기:** [{hani_url}]({hani_url})")
+    st.info("아래 기사는 한겨레 웹사이트에서 제공됩니다. 제목을 누르면 원문으로 이동합니다.")
+    render_article_card(hani_url)
 
-with tab4:
+def render_planet_tab():
     st.subheader("플래닛 03: '식량위기, 바다가 보내는 경고' 기사")
     planet_url = "https://www.planet03.com/post/%EC%8B%9D%EB%9F%89%EC%9C%84%EA%B8%B0-%EB%B0%94%EB%8B%A4%EA%B0%80-%EB%B3%B4%EB%8B%A4%EA%B0%80-%EB%B3%B4%EB%82%B4%EB%8A%94-%EA%B2%BD%EA%B3%A0"
-    st.info("아래 기사는 플래닛 03 웹사이트에서 제공됩니다.")
-    try:
-        components.html(
-            f'<iframe src="{planet_url}" width="100%" height="800px" style="border:none;"></iframe>',
-            height=820,
-            scrolling=True
-        )
-    except Exception as e:
-        st.error(f"뉴스 기사를 불러오는 데 실패했습니다: {e}")
-        st.markdown(f"**직접 방문하기:** [{planet_url}]({planet_url})")
+    st.info("아래 기사는 플래닛 03 웹사이트에서 제공됩니다. 제목을 누르면 원문으로 이동합니다.")
+    render_article_card(planet_url)
+
+def move_quiz_page(step: int):
+    st.session_state['quiz_page'] += step
+
+# 라디오를 누르거나 페이지를 넘겨도 퀴즈 부분만 다시 실행되고, 현재 문제 하나만 그립니다.
+@st.fragment
+@perf.fragment_scope("quiz")
+def render_quiz_tab():
+    from assets import asset_url
 
-with tab5:
     st.title("산호초 백화현상 퀴즈")
     st.write("사진을 보고 산호의 상태를 맞춰보세요!")
 
-    # 문제와 정답 (이미지 URL 사용)
-    quiz = [
-        {
-            "question": "1. 이 산호의 상태는 무엇일까요?",
-            "image": "https://cdn.greenpostkorea.co.kr/news/photo/201704/75294_62473_art_1491801757.jpg",  # 정상 산호 이미지
-            "options": ["정상", "백화", "죽은 산호", "조류 과다"],
-            "answer": "백화"
-        },
-        {
-            "question": "2. 산호초 백화현상의 주요 원인은 무엇일까요?",
-            "image": None,
-            "options": ["해수온 상승", "조류 활동 증가", "바닷물 염도 감소", "산소 과다"],
-            "answer": "해수온 상승"
-        },
-        {
-            "question": "3. 산호초가 건강할 때 주로 공생하는 생물은 무엇인가요?",
-            "image": None,
-            "options": ["조류(산호 조류)", "해파리", "상어", "펭귄"],
-            "answer": "조류(산호 조류)"
-        },
-        {
-            "question": "4. 백화된 산호초를 보호하기 위해 할 수 있는 활동으로 적절한 것은?",
-            "image": None,
-            "options": ["해수온 조절", "해양 오염 감소", "산호 채집", "인공 조류 제거"],
-            "answer": "해수온 조절"
-        }
-    ]
-
-    # 사용자의 답변을 저장할 상태 변수
-    if 'quiz_answers' not in st.session_state:
-        st.session_state['quiz_answers'] = {}
+    # 사용자의 답변을 저장할 상태 변수 (답은 문제별 라디오가 persist_state 로 보관합니다)
     if 'quiz_submitted' not in st.session_state:
         st.session_state['quiz_submitted'] = False
+    if 'quiz_page' not in st.session_state:
+        st.session_state['quiz_page'] = 0
 
-    # 퀴즈 문제 표시 및 답변 받기
-    for i, q in enumerate(quiz, 1):
-        st.markdown(f"**{q['question']}**")
-    
-        if q["image"]:
-            st.image(q["image"], use_container_width=True)
-    
-        # 사용자 답변을 session_state에 저장
-        st.session_state['quiz_answers'][i] = st.radio("선택하세요", q["options"], key=i, index=None)
-        
-        st.markdown("---")
+    # 현재 문제 표시 및 답변 받기
+    page = st.session_state['quiz_page']
+    i, q = page + 1, QUIZ[page]
+    st.progress(i / len(QUIZ), text=f"문제 {i}/{len(QUIZ)}")
+    st.markdown(f"**{q['question']}**")
+
+    if q["image"]:
+        st.image(asset_url(q["image"]), width="stretch")
+
+    # 다른 문제/탭에 다녀와도 이전 답변이 남도록 세션 동안 값을 보관합니다.
+    st.radio("선택하세요", q["options"], key=f"quiz_answer_{i}", index=None, persist_state="session")
+
+    col_prev, col_next = st.columns(2)
+    col_prev.button("◀ 이전 문제", on_click=move_quiz_page, args=(-1,), disabled=page == 0, width="stretch")
+    col_next.button("다음 문제 ▶", on_click=move_quiz_page, args=(1,), disabled=page == len(QUIZ) - 1, width="stretch")
+
+    st.markdown("---")
 
     # 제출 버튼
     if st.button("최종 채점"):
@@ -351,8 +325,8 @@ with tab5:
     if st.session_state['quiz_submitted']:
         score = 0
         st.subheader("🌟 채점 결과")
-        for i, q in enumerate(quiz, 1):
-            user_answer = st.session_state['quiz_answers'].get(i)
+        for i, q in enumerate(QUIZ, 1):
+            user_answer = st.session_state.get(f"quiz_answer_{i}")
             correct_answer = q['answer']
             
             # 사용자 답변이 없을 경우 처리
@@ -360,19 +334,42 @@ with tab5:
                 st.markdown(f"**문제 {i}:** 응답이 없습니다.")
                 continue
 
+            if q["image"]:
+                st.image(asset_url(q["image"], "thumb"), width=120)
+
             if user_answer == correct_answer:
                 score += 1
                 st.markdown(f"✅ **문제 {i}:** 정답입니다! (선택: **{user_answer}**)")
             else:
                 st.markdown(f"❌ **문제 {i}:** 오답입니다. (선택: **{user_answer}**, 정답: **{correct_answer}**)")
 
-        st.subheader(f"🏆 최종 점수: {score}/{len(quiz)}")
+        st.subheader(f"🏆 최종 점수: {score}/{len(QUIZ)}")
         st.session_state['quiz_submitted'] = False
 
+# ---------------------------
+# 탭 라우터: 선택된 탭만 실행/전송합니다
+# ---------------------------
+TABS = {
+    "메인": render_main_tab,
+    "보고서": render_report_tab,
+    "한겨레 뉴스": render_hani_tab,
+    "플래닛 03 뉴스": render_planet_tab,
+    "퀴즈": render_quiz_tab,
+}
+
+# 실행되지 않은 탭의 위젯 값은 각 위젯의 persist_state="session" 으로 보관되므로,
+# 탭을 다시 열면 마지막 상태가 그대로 보입니다.
+for tab, render_tab in zip(st.tabs(list(TABS), key="active_tab", on_change="rerun"), TABS.values()):
+    if tab.open:
+        with tab, perf.span(f"tab.{render_tab.__name__}"):
+            render_tab()
+
 # ---------------------------
 # 하단: 메타/저작권/주의
 # ---------------------------
 st.markdown("---")
-st.caption(
-    "주의: 본 대시보드는 교육/설명 목적입니다. 공식 관측/정책 근거가 필요할 경우 원출처(NOAA, NCEI, NASA 등) 데이터와 원문 레퍼런스를 직접 확인하세요."
-)
+st.caption(content.FOOTER_CAPTION)
+
+# 계측 패널(켜져 있을 때만)과 이번 재실행 기록
+perf.render_debug_panel()
+perf.end_rerun()
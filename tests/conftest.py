@@ -0,0 +1,11 @@
+"""
+테스트 공통 설정
+- 앱 모듈은 저장소 최상위에 있으므로 import 경로에 추가합니다.
+- Streamlit 서버 없이 캐시 함수를 부르면 경고만 남기고 그대로 동작합니다.
+"""
+
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
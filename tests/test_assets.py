@@ -0,0 +1,136 @@
+import http.server
+import io
+import json
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+import assets
+
+
+def _png(size=(1200, 800), color=(30, 120, 200)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.body = _png()
+        self.requests = 0
+        # trickle: 한 바이트씩 천천히 보냄
+        self.mode = "ok"
+        self.release = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/coral.png"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        if server.mode == "trickle":
+            for byte in server.body:
+                if server.release.is_set():
+                    return
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.05)
+            return
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = _Server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def asset_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "QUIZ_ASSET_DIR", tmp_path)
+    monkeypatch.setattr(assets, "MANIFEST_PATH", tmp_path / "manifest.json")
+    monkeypatch.setattr(assets, "FETCH_TIMEOUT", 1)
+    monkeypatch.setattr(assets, "_manifest", None)
+    monkeypatch.setattr(assets, "_failed_at", {})
+    monkeypatch.setattr(assets, "_importing", set())
+    return tmp_path
+
+
+def _wait_for_import(source: str, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while assets.is_importing(source):
+        assert time.monotonic() < deadline, "백그라운드 가져오기가 끝나지 않았습니다"
+        time.sleep(0.01)
+
+
+def test_import_image_writes_sizes_and_manifest(tmp_path, asset_dir):
+    source = tmp_path / "coral.png"
+    source.write_bytes(_png())
+
+    digest = assets.import_image(str(source))
+
+    for size_name, max_size in assets.ASSET_SIZES.items():
+        with Image.open(asset_dir / f"{digest}-{size_name}.jpg") as image:
+            assert image.width <= max_size[0] and image.height <= max_size[1]
+            assert image.width / image.height == pytest.approx(1.5, rel=0.01)
+    manifest = json.loads(assets.MANIFEST_PATH.read_text(encoding="utf-8"))
+    assert manifest == {str(source): digest}
+
+
+def test_same_content_gets_same_digest(tmp_path):
+    first, second = tmp_path / "a.png", tmp_path / "b.png"
+    first.write_bytes(_png())
+    second.write_bytes(_png())
+    assert assets.import_image(str(first)) == assets.import_image(str(second))
+
+
+def test_manifest_hit_returns_static_url(tmp_path):
+    source = tmp_path / "coral.png"
+    source.write_bytes(_png())
+    digest = assets.import_image(str(source))
+
+    assert assets.asset_url(str(source), "thumb") == f"{assets.STATIC_URL_PREFIX}/{digest}-thumb.jpg"
+    assert not assets.is_importing(str(source))
+
+
+def test_miss_falls_back_to_source_and_imports_in_background(server):
+    assert assets.asset_url(server.url) == server.url
+    assert assets.asset_url(server.url) == server.url  # 가져오는 중에는 다시 요청하지 않습니다.
+    _wait_for_import(server.url)
+
+    assert assets.asset_url(server.url).startswith(assets.STATIC_URL_PREFIX)
+    assert server.requests == 1
+
+
+def test_slow_source_does_not_block_render_and_backs_off(server):
+    server.mode = "trickle"  # 바이트마다 소켓 제한 시간 안에 도착하지만 전체로는 FETCH_TIMEOUT 을 넘깁니다.
+
+    start = time.monotonic()
+    assert assets.asset_url(server.url) == server.url
+    assert time.monotonic() - start < 0.5
+
+    _wait_for_import(server.url, timeout=assets.FETCH_TIMEOUT + 2)
+    assert server.url in assets._failed_at
+    assert assets.asset_url(server.url) == server.url
+    assert not assets.is_importing(server.url)  # RETRY_AFTER 동안은 다시 시도하지 않습니다.
+    assert server.requests == 1
@@ -0,0 +1,197 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import correlation
+from correlation import DRIVERS, CorrelationEngine
+
+COUNTRIES = ["전 지구", "호주", "일본"]
+
+
+def _panel(days: int, japan_from: int | None = None, seed: int = 0):
+    """(국가 목록, 날짜, 지수, {지표: 값}) 예시 패널. japan_from 이 None 이면 일본 값은 모두 NaN."""
+    rng = np.random.default_rng(seed)
+    dates = (np.datetime64("2015-01-01") + np.arange(days)).astype("datetime64[ns]")
+    x = rng.normal(size=(days, len(COUNTRIES) - 1))
+    y = 0.7 * x + rng.normal(scale=0.5, size=x.shape)
+    if japan_from is None:
+        x[:, 1] = y[:, 1] = np.nan
+    else:
+        x[:japan_from, 1] = y[:japan_from, 1] = np.nan
+
+    def with_world(values):
+        return np.concatenate([np.nanmean(values, axis=1, keepdims=True), values], axis=1)
+
+    drivers = {key: with_world(x * (i + 1)) for i, key in enumerate(DRIVERS.values())}
+    return COUNTRIES, dates, with_world(y), drivers
+
+
+def _full_build(panel) -> CorrelationEngine:
+    countries, days, bleaching, drivers = panel
+    engine = CorrelationEngine(countries)
+    engine.append(days, bleaching, drivers)
+    return engine
+
+
+@pytest.fixture
+def panels(monkeypatch):
+    """버전 이름 → 패널. load_correlation_engine 이 이 패널을 읽도록 바꿉니다."""
+    table = {}
+    monkeypatch.setattr(correlation, "_daily_panel", lambda version: table[version])
+    monkeypatch.setattr(correlation, "_latest", None)
+    correlation.load_correlation_engine.clear()
+    yield table
+    correlation.load_correlation_engine.clear()
+
+
+def _assert_same(engine: CorrelationEngine, expected: CorrelationEngine) -> None:
+    np.testing.assert_array_equal(engine.days, expected.days)
+    np.testing.assert_allclose(engine.rolling(), expected.rolling(), atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(engine.lagged(), expected.lagged(), atol=1e-9, equal_nan=True)
+
+
+def test_appended_dates_extend_previous_engine(panels):
+    full = _panel(800, japan_from=0)
+    panels["v1"] = (full[0], full[1][:600], full[2][:600], {k: v[:600] for k, v in full[3].items()})
+    panels["v2"] = full
+
+    first = correlation.load_correlation_engine("v1")
+    second = correlation.load_correlation_engine("v2")
+
+    assert second._shift is first._shift  # 이어서 누적했는지 (다시 만들면 이동량도 새로 계산됩니다)
+    _assert_same(second, _full_build(full))
+
+
+def test_revised_rows_rebuild_from_scratch(panels):
+    # 호주만 적재한 뒤, 같은 기간에 일본을 추가로 적재한 경우 (날짜는 같고 과거 값이 바뀜)
+    panels["australia"] = _panel(700)
+    panels["australia+japan"] = _panel(700, japan_from=0)
+
+    correlation.load_correlation_engine("australia")
+    engine = correlation.load_correlation_engine("australia+japan")
+
+    japan = engine.column("해수온 편차", "일본")
+    assert engine._cumsum[-1, correlation._N, japan] == 700
+    _assert_same(engine, _full_build(panels["australia+japan"]))
+
+
+def test_revised_rows_with_appended_dates_rebuild(panels):
+    old, new = _panel(500), _panel(650, japan_from=300)
+    panels["old"] = (old[0], old[1], old[2], old[3])
+    panels["new"] = new
+
+    correlation.load_correlation_engine("old")
+    engine = correlation.load_correlation_engine("new")
+
+    _assert_same(engine, _full_build(new))
+
+
+def test_extends_requires_identical_prefix():
+    panel = _panel(400, japan_from=100)
+    engine = _full_build((panel[0], panel[1][:300], panel[2][:300], {k: v[:300] for k, v in panel[3].items()}))
+
+    assert engine.extends(*panel[1:])
+    revised = panel[2].copy()
+    revised[10, 1] += 1.0
+    assert not engine.extends(panel[1], revised, panel[3])
+    assert not engine.extends(panel[1][:200], panel[2][:200], {k: v[:200] for k, v in panel[3].items()})
+
+
+def test_short_coverage_needs_min_pairs():
+    # 40일뿐인 자료: 시차가 10일을 넘으면 쌍이 MIN_PAIRS 보다 적어 상관계수를 내지 않습니다.
+    engine = _full_build(_panel(40, japan_from=0))
+
+    lagged = engine.lagged()
+    pairs = 40 - np.arange(engine.max_lag + 1)
+    assert np.isfinite(lagged[pairs >= correlation.MIN_PAIRS]).all()
+    assert np.isnan(lagged[pairs < correlation.MIN_PAIRS]).all()
+    # 30일 창도 MIN_PAIRS 개가 모두 있어야 합니다.
+    assert np.isfinite(engine.rolling((30,))[0, 29:]).all()
+
+
+def test_sparse_window_below_min_pairs_is_nan():
+    panel = _panel(60, japan_from=0)
+    bleaching = panel[2].copy()
+    bleaching[30:35] = np.nan  # 30일 창의 80% 는 넘지만 MIN_PAIRS 에는 못 미치는 창들
+    engine = _full_build((panel[0], panel[1], bleaching, panel[3]))
+
+    rolling = engine.rolling((30,))[0]
+    assert np.isnan(rolling[30:64]).all()
+    assert np.isfinite(rolling[29]).all()
+
+
+@pytest.fixture
+def crw_frame(tmp_path, monkeypatch):
+    pd = pytest.importorskip("pandas")
+    ds = pytest.importorskip("pyarrow.dataset")
+    import aggregates
+    import timeseries
+    from ingest import PARTITIONING, write_partitioned
+
+    rng = np.random.default_rng(1)
+    frames = []
+    for country, start, periods in (("호주", "2015-12-20", 40), ("일본", "2016-01-05", 30), ("Atlantis", "2015-12-01", 10)):
+        dates = pd.date_range(start, periods=periods, freq="D").repeat(2)  # 하루에 관측 지점 2개
+        values = rng.normal(size=(len(dates), 4)).astype(np.float32)
+        values[rng.random(values.shape) < 0.1] = np.nan
+        frames.append(pd.DataFrame({
+            "date": dates,
+            "country": country,
+            "sst": values[:, 0],
+            "ssta": values[:, 1],
+            "dhw": values[:, 2],
+            "bleaching_index": values[:, 3],
+            "year": dates.year.astype("int16"),
+        }))
+    frame = pd.concat(frames, ignore_index=True)
+    write_partitioned(frame, tmp_path)
+    monkeypatch.setattr(aggregates, "open_crw_dataset", lambda version: ds.dataset(tmp_path, format="parquet", partitioning=PARTITIONING))
+    aggregates.load_daily_index.clear()
+    timeseries._daily_arrays.clear()
+    yield frame
+    aggregates.load_daily_index.clear()
+    timeseries._daily_arrays.clear()
+
+
+def test_crw_panel_matches_pandas_pivot(crw_frame):
+    pd = pytest.importorskip("pandas")
+
+    countries, days, bleaching, drivers = correlation._daily_panel("crw-test")
+
+    expected_countries = [c for c in correlation.COUNTRIES if c != correlation.GLOBAL]
+    assert countries == [correlation.GLOBAL, *expected_countries]
+    wide = crw_frame.pivot_table(index="date", columns="country", aggfunc="mean", dropna=False)
+    # 전 지구는 추세 차트처럼 대시보드에 없는 국가(Atlantis)까지 포함한 모든 관측의 평균입니다.
+    expected_days = pd.date_range("2015-12-01", "2016-02-03", freq="D")
+    np.testing.assert_array_equal(days, expected_days.to_numpy())
+    for name, actual in (("bleaching_index", bleaching), *((key, drivers[key]) for key in DRIVERS.values())):
+        values = wide[name].reindex(index=expected_days, columns=expected_countries).to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(actual[:, 1:], values, rtol=1e-6, atol=1e-6, equal_nan=True)
+        world = crw_frame.groupby("date")[name].mean().reindex(expected_days).to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(actual[:, 0], world, rtol=1e-6, atol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("version", ["crw-test", "synthetic"])
+def test_global_column_is_the_plotted_trend(crw_frame, version):
+    import timeseries
+    from data_layer import DATA_VERSION
+
+    version = DATA_VERSION if version == "synthetic" else version
+    countries, days, bleaching, _ = correlation._daily_panel(version)
+    dates, trend = timeseries._daily_arrays(version, correlation.GLOBAL)
+
+    np.testing.assert_array_equal(days, dates)
+    np.testing.assert_allclose(bleaching[:, countries.index(correlation.GLOBAL)], trend, rtol=1e-6, equal_nan=True)
+
+
+def test_yearly_global_trend_uses_the_same_definition(crw_frame):
+    import aggregates
+
+    aggregates.load_aggregate_index.clear()
+    try:
+        yearly = aggregates.load_aggregate_index("crw-test").trend(correlation.GLOBAL)
+    finally:
+        aggregates.load_aggregate_index.clear()
+    expected = crw_frame.groupby(crw_frame["date"].dt.year)["bleaching_index"].mean()
+    np.testing.assert_allclose(yearly["백화현상지수"].to_numpy(), expected.to_numpy(), rtol=1e-6)
@@ -0,0 +1,50 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+import data_layer
+import export
+from aggregates import GLOBAL
+
+
+@pytest.fixture
+def scaled(monkeypatch):
+    # 관측 지점 3개, 블록은 수십 일 단위가 되도록 작게 잡습니다.
+    monkeypatch.setattr(data_layer, "DATA_SCALE", 3)
+    monkeypatch.setattr(export, "DATA_SCALE", 3)
+    monkeypatch.setattr(data_layer, "DAILY_BLOCK_VALUES", 1000)
+    monkeypatch.setattr(export, "CHUNK_ROWS", 500)
+    for fn in (data_layer.load_bleaching_frame, data_layer.load_daily_matrix, data_layer.load_daily_drivers):
+        fn.clear()
+    yield
+    for fn in (data_layer.load_bleaching_frame, data_layer.load_daily_matrix, data_layer.load_daily_drivers):
+        fn.clear()
+
+
+def _sites(lo=0, hi=None) -> np.ndarray:
+    return np.concatenate([sites for _, _, sites in data_layer.iter_daily_sites(lo=lo, hi=hi)])
+
+
+def test_partial_range_matches_full_generation(scaled):
+    full = _sites()
+    assert full.shape[1:] == (len(data_layer.COUNTRIES), 3)
+    # 블록 경계에 걸치지 않는 구간도 전체를 만들 때와 같은 값이어야 합니다.
+    np.testing.assert_array_equal(_sites(1005, 1100), full[1005:1100])
+
+
+def test_daily_matrix_is_site_mean(scaled):
+    days, values = data_layer.load_daily_matrix()
+    assert values.shape == (len(days), len(data_layer.COUNTRIES))
+    np.testing.assert_allclose(values, _sites().mean(axis=2), rtol=1e-6)
+
+
+def test_export_writes_one_row_per_site(scaled):
+    days, values = data_layer.load_daily_matrix()
+    batches = list(export.iter_batches(data_layer.DATA_VERSION, GLOBAL, 2016))
+    table = pa.Table.from_batches(batches)
+
+    year = slice(days.searchsorted("2016-01-01"), days.searchsorted("2017-01-01"))
+    assert table.num_rows == 366 * len(data_layer.COUNTRIES) * 3
+    assert max(batch.num_rows for batch in batches) <= 500
+    means = table.column("백화현상지수").to_numpy().reshape(-1, len(data_layer.COUNTRIES), 3).mean(axis=2)
+    np.testing.assert_allclose(means, values[year], rtol=1e-6)
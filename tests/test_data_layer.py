@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_layer
+
+LOADERS = (data_layer.load_bleaching_frame, data_layer.load_daily_matrix, data_layer.load_daily_drivers)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for loader in LOADERS:
+        loader.clear()
+    yield
+    for loader in LOADERS:
+        loader.clear()
+
+
+def test_bleaching_frame_is_cached_per_version_and_seed():
+    first = data_layer.load_bleaching_frame()
+    assert data_layer.load_bleaching_frame() is first
+    assert data_layer.load_bleaching_frame(seed=data_layer.DATA_SEED + 1) is not first
+
+
+def test_bleaching_frame_is_stable_across_cache_clears():
+    first = data_layer.load_bleaching_frame().copy()
+    data_layer.load_bleaching_frame.clear()
+    pd.testing.assert_frame_equal(data_layer.load_bleaching_frame(), first)
+
+
+def test_different_seed_gives_different_values():
+    first = data_layer.load_bleaching_frame()
+    other = data_layer.load_bleaching_frame(seed=data_layer.DATA_SEED + 1)
+    pd.testing.assert_series_equal(first["나라"], other["나라"])
+    assert not np.allclose(first["백화현상지수"], other["백화현상지수"])
+
+
+def test_daily_arrays_are_stable_and_read_only():
+    days, values = data_layer.load_daily_matrix()
+    ssta, dhw = data_layer.load_daily_drivers()
+    expected = [values.copy(), ssta.copy(), dhw.copy()]
+    for loader in LOADERS:
+        loader.clear()
+
+    again_days, again_values = data_layer.load_daily_matrix()
+    again = [again_values, *data_layer.load_daily_drivers()]
+    pd.testing.assert_index_equal(again_days, days)
+    for actual, wanted in zip(again, expected):
+        np.testing.assert_array_equal(actual, wanted)
+        assert not actual.flags.writeable
@@ -0,0 +1,132 @@
+import gzip
+import io
+import os
+import pathlib
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import data_layer
+import export
+from aggregates import GLOBAL
+from data_layer import DATA_VERSION
+from ingest import ingest
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures" / "crw"
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_DIR", tmp_path / "exports")
+    return tmp_path / "exports"
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """iter_batches 가 불린 (버전, 나라, 연도) 목록 = 실제로 파일을 만든 횟수."""
+    calls = []
+    iter_batches = export.iter_batches
+
+    def counting(version, country, year=None):
+        calls.append((version, country, year))
+        return iter_batches(version, country, year)
+
+    monkeypatch.setattr(export, "iter_batches", counting)
+    return calls
+
+
+def _age(path: pathlib.Path, seconds: float) -> None:
+    stamp = path.stat().st_mtime - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_cache_is_keyed_per_filter(builds):
+    filters = [
+        (GLOBAL, 2001, "CSV", False),
+        ("호주", 2001, "CSV", False),
+        (GLOBAL, 2002, "CSV", False),
+        (GLOBAL, None, "CSV", False),
+        (GLOBAL, 2001, "Parquet", False),
+        (GLOBAL, 2001, "CSV", True),
+    ]
+    paths = [export.export_path(DATA_VERSION, *f) for f in filters]
+
+    assert len(set(paths)) == len(filters)
+    assert len(builds) == len(filters)
+
+
+def test_cache_hit_does_not_rebuild_and_refreshes_use_time(builds):
+    path = export.export_path(DATA_VERSION, "일본", 2010, "Parquet", True)
+    content = path.read_bytes()
+    _age(path, 3600)
+    stale = path.stat().st_mtime
+
+    assert export.export_path(DATA_VERSION, "일본", 2010, "Parquet", True) == path
+    assert export.export_bytes(DATA_VERSION, "일본", 2010, "Parquet", True) == content
+    assert len(builds) == 1
+    assert path.stat().st_mtime > stale
+
+
+def test_least_recently_used_files_are_evicted(monkeypatch, export_dir):
+    first = export.export_path(DATA_VERSION, GLOBAL, 2001, "CSV", False)
+    second = export.export_path(DATA_VERSION, GLOBAL, 2002, "CSV", False)
+    _age(first, 200)
+    _age(second, 100)
+    # 먼저 만든 파일을 다시 쓰면 두 번째 파일이 가장 오래 쓰이지 않은 파일이 됩니다.
+    export.export_path(DATA_VERSION, GLOBAL, 2001, "CSV", False)
+    monkeypatch.setattr(export, "EXPORT_CACHE_BYTES", int(first.stat().st_size * 2.5))
+
+    third = export.export_path(DATA_VERSION, GLOBAL, 2003, "CSV", False)
+
+    assert first.exists() and third.exists()
+    assert not second.exists()
+    assert sum(p.stat().st_size for p in export_dir.glob("*.export")) <= export.EXPORT_CACHE_BYTES
+
+
+def test_new_file_is_kept_even_when_over_budget(monkeypatch, export_dir):
+    monkeypatch.setattr(export, "EXPORT_CACHE_BYTES", 1)
+    export.export_path(DATA_VERSION, GLOBAL, 2001, "CSV", False)
+    newest = export.export_path(DATA_VERSION, GLOBAL, 2002, "CSV", False)
+
+    assert list(export_dir.glob("*.export")) == [newest]
+    assert not list(export_dir.glob("*.tmp"))
+
+
+@pytest.fixture
+def crw(tmp_path, monkeypatch):
+    root = tmp_path / "crw"
+    ingest([FIXTURES / "australia_5km.txt", FIXTURES / "japan_5km.csv"], root)
+    monkeypatch.setattr(export, "open_crw_dataset", lambda version: data_layer.open_crw_dataset(version, root=str(root)))
+    return "crw-test"
+
+
+def _read_csv(path: pathlib.Path, compressed: bool) -> pd.DataFrame:
+    data = path.read_bytes()
+    return pd.read_csv(io.BytesIO(gzip.decompress(data) if compressed else data), parse_dates=["날짜"])
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_crw_export_writes_ingested_rows(crw, compressed):
+    frame = _read_csv(export.export_path(crw, GLOBAL, None, "CSV", compressed), compressed)
+
+    assert len(frame) == 7 + 4
+    assert frame.groupby("나라").size().to_dict() == {"일본": 4, "호주": 7}
+    australia = frame[frame["나라"] == "호주"].sort_values("날짜")
+    assert australia["날짜"].iloc[0] == pd.Timestamp("2015-12-29")
+    assert australia["백화현상지수"].tolist() == [0, 0, 25, 25, 50, 50, 75]
+
+
+def test_crw_export_filters_country_and_year(crw):
+    path = export.export_path(crw, "호주", 2016, "Parquet", True)
+    table = pq.read_table(path)
+
+    # 같은 필터라도 데이터 버전이 다르면 다른 파일입니다.
+    assert export.export_path(DATA_VERSION, "호주", 2016, "Parquet", True) != path
+
+    assert table.schema.equals(export.EXPORT_SCHEMA)
+    assert table.column("나라").to_pylist() == ["호주"] * 4
+    assert [d.isoformat() for d in table.column("날짜").to_pylist()] == [
+        "2016-01-01", "2016-01-02", "2016-01-03", "2016-01-04",
+    ]
+    assert table.column("DHW").to_pylist()[-1] == pytest.approx(0.60)
@@ -0,0 +1,71 @@
+import pathlib
+import urllib.parse
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pytest
+
+from ingest import CRW_SCHEMA, PARTITIONING, ingest, read_crw_csv, read_source
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures" / "crw"
+
+
+def test_reads_column_aligned_crw_text_with_header_block():
+    frame = read_crw_csv(FIXTURES / "australia_5km.txt")
+
+    assert list(frame.columns) == CRW_SCHEMA.names
+    assert len(frame) == 7
+    assert (frame["country"] == "호주").all()
+    assert frame["date"].iloc[0] == pd.Timestamp("2015-12-29")
+    assert frame["date"].iloc[-1] == pd.Timestamp("2016-01-04")
+    np.testing.assert_allclose(frame["sst"].iloc[:2], [28.53, 28.61])
+    np.testing.assert_allclose(frame["ssta"].iloc[-1], 1.11)
+    np.testing.assert_allclose(frame["dhw"].iloc[-1], 0.60)
+    # BAA(0~4) → 백화현상 지수(0~100)
+    np.testing.assert_allclose(frame["bleaching_index"], [0, 0, 25, 25, 50, 50, 75])
+    assert frame["year"].tolist() == [2015, 2015, 2015, 2016, 2016, 2016, 2016]
+
+
+def test_reads_comma_separated_csv():
+    frame = read_source(FIXTURES / "japan_5km.csv")
+
+    assert len(frame) == 4
+    assert (frame["country"] == "일본").all()
+    np.testing.assert_allclose(frame["sst"], [22.41, 22.38, 22.52, 22.60])
+    # BAA 가 없으면 DHW 에서 환산합니다.
+    np.testing.assert_allclose(frame["bleaching_index"], frame["dhw"] / 12 * 100, rtol=1e-6)
+
+
+def test_country_option_overrides_file_name():
+    frame = read_crw_csv(FIXTURES / "japan_5km.csv", country="필리핀")
+    assert (frame["country"] == "필리핀").all()
+
+
+def test_ingest_writes_year_country_partitions(tmp_path):
+    rows = ingest([FIXTURES / "australia_5km.txt", FIXTURES / "japan_5km.csv"], tmp_path)
+
+    assert rows == 11
+    # hive 파티션 디렉터리 이름은 URL 인코딩되어 있습니다.
+    partitions = sorted(urllib.parse.unquote(p.relative_to(tmp_path).parent.as_posix()) for p in tmp_path.rglob("*.parquet"))
+    assert partitions == ["year=2015/country=호주", "year=2016/country=일본", "year=2016/country=호주"]
+
+    table = ds.dataset(tmp_path, format="parquet", partitioning=PARTITIONING).to_table(
+        filter=(ds.field("country") == "호주") & (ds.field("year") == 2016)
+    )
+    assert table.num_rows == 4
+
+
+def test_reingesting_a_country_replaces_only_its_partitions(tmp_path):
+    ingest([FIXTURES / "australia_5km.txt", FIXTURES / "japan_5km.csv"], tmp_path)
+    ingest([FIXTURES / "japan_5km.csv"], tmp_path)
+
+    table = ds.dataset(tmp_path, format="parquet", partitioning=PARTITIONING).to_table()
+    assert table.num_rows == 11
+
+
+@pytest.mark.parametrize("name", ["australia_5km.txt", "japan_5km.csv"])
+def test_fixture_dates_are_daily_and_sorted(name):
+    dates = read_source(FIXTURES / name)["date"]
+    assert dates.is_monotonic_increasing
+    assert (dates.diff().dropna() == pd.Timedelta(days=1)).all()
@@ -0,0 +1,148 @@
+import http.server
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import news_preview
+
+PAGE = """<html><head><title>{title}</title>
+<meta property="og:description" content="산호초 백화현상에 관한 기사 요약입니다.">
+</head><body><p>본문</p></body></html>"""
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.title = "첫 제목"
+        self.requests = 0
+        # hang: 응답하지 않음, trickle: 한 바이트씩 천천히 보냄
+        self.mode = "ok"
+        self.release = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/article"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.mode == "hang":
+            server.release.wait(10)
+            return
+        body = PAGE.format(title=server.title).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if server.mode == "trickle":
+            for byte in body:
+                if server.release.is_set():
+                    return
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.05)
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = _Server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_preview, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(news_preview, "FETCH_TIMEOUT", 1)
+    monkeypatch.setattr(news_preview, "_failed_at", {})
+    monkeypatch.setattr(news_preview, "_refreshing", set())
+    return tmp_path
+
+
+def _wait_for_fetch(url: str, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while news_preview.is_fetching(url):
+        assert time.monotonic() < deadline, "백그라운드 가져오기가 끝나지 않았습니다"
+        time.sleep(0.01)
+
+
+def test_first_fetch_runs_in_background(server):
+    assert news_preview.get_preview(server.url) is None
+    _wait_for_fetch(server.url)
+
+    preview = news_preview.get_preview(server.url)
+    assert preview.title == "첫 제목"
+    assert preview.lead == "산호초 백화현상에 관한 기사 요약입니다."
+
+
+def test_fresh_cache_is_served_without_request(server):
+    news_preview.get_preview(server.url)
+    _wait_for_fetch(server.url)
+    requests = server.requests
+
+    for _ in range(3):
+        assert news_preview.get_preview(server.url).title == "첫 제목"
+    assert not news_preview.is_fetching(server.url)
+    assert server.requests == requests
+
+
+def test_stale_cache_is_served_then_refreshed(server, cache_dir):
+    news_preview.fetch_preview(server.url)
+    path = cache_dir / f"{news_preview._cache_key(server.url)}.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["fetched_at"] -= news_preview.PREVIEW_TTL + 1
+    path.write_text(json.dumps(data), encoding="utf-8")
+    server.title = "새 제목"
+
+    assert news_preview.get_preview(server.url).title == "첫 제목"
+    _wait_for_fetch(server.url)
+    assert news_preview.get_preview(server.url).title == "새 제목"
+
+
+def test_unreachable_host_fails_once_and_backs_off():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}/article"  # 듣고 있지 않은 포트
+
+    assert news_preview.get_preview(url) is None
+    _wait_for_fetch(url)
+    assert url in news_preview._failed_at
+
+    assert news_preview.get_preview(url) is None
+    assert not news_preview.is_fetching(url)  # RETRY_AFTER 동안은 다시 시도하지 않습니다.
+
+
+def test_hanging_server_does_not_block_rerun(server):
+    server.mode = "hang"
+
+    start = time.monotonic()
+    assert news_preview.get_preview(server.url) is None
+    assert time.monotonic() - start < 0.5
+
+    _wait_for_fetch(server.url, timeout=news_preview.FETCH_TIMEOUT + 2)
+    assert server.url in news_preview._failed_at
+
+
+def test_deadline_covers_whole_request(server):
+    server.mode = "trickle"  # 바이트마다 소켓 제한 시간 안에 도착하지만 전체로는 FETCH_TIMEOUT 을 넘깁니다.
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        news_preview.fetch_preview(server.url)
+    assert time.monotonic() - start < news_preview.FETCH_TIMEOUT + 0.5
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import reef_sites
+from aggregates import GLOBAL
+from data_layer import DATA_VERSION
+from reef_sites import BINNERS, bin_sites, viewport
+
+# 축 좌표에서 이웃한 육각형 여섯 칸
+HEX_NEIGHBOURS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
+
+
+@pytest.fixture
+def sites(monkeypatch):
+    monkeypatch.setattr(reef_sites, "SITE_COUNT", 20_000)
+    reef_sites.load_reef_sites.clear()
+    yield reef_sites.load_reef_sites(DATA_VERSION)
+    reef_sites.load_reef_sites.clear()
+
+
+@pytest.mark.parametrize("method", list(BINNERS))
+@pytest.mark.parametrize(("region", "zoom"), [(GLOBAL, 0), (GLOBAL, 3), ("호주", 2), ("필리핀", 5)])
+def test_bin_counts_add_up_to_sites_in_viewport(sites, method, region, zoom):
+    values = sites.values(DATA_VERSION, 2000)
+    west, east, south, north = viewport(region, zoom)
+    inside = (sites.lon >= west) & (sites.lon <= east) & (sites.lat >= south) & (sites.lat <= north) & ~np.isnan(values)
+
+    bins = bin_sites(DATA_VERSION, 2000, region, zoom, method)
+
+    assert inside.sum() > 0
+    assert bins.total == inside.sum() == bins.count.sum()
+    assert (bins.count > 0).all()
+    # 칸 평균을 개수로 다시 묶으면 보이는 지점 전체의 평균과 같아야 합니다.
+    np.testing.assert_allclose((bins.mean * bins.count).sum() / bins.total, values[inside].mean(), rtol=1e-5)
+    # 칸 중심은 서로 겹치지 않습니다.
+    assert len(set(zip(bins.lon.round(6), bins.lat.round(6)))) == len(bins.count)
+
+
+def test_empty_viewport_returns_no_bins(sites, monkeypatch):
+    monkeypatch.setattr(reef_sites, "viewport", lambda region, zoom: (-40.0, -30.0, -60.0, -55.0))
+    bins = bin_sites(DATA_VERSION, 2000, GLOBAL, 5)
+    assert bins.total == 0 and len(bins.count) == 0
+
+
+@pytest.mark.parametrize("size", [0.05, 1.0, 3.7])
+def test_hex_cells_round_trip_through_centers(size):
+    rng = np.random.default_rng(0)
+    lon, lat = rng.uniform(-180, 180, 50_000), rng.uniform(-90, 90, 50_000)
+    to_cells, to_centers, _ = BINNERS["육각형"]
+
+    q, r = to_cells(lon, lat, size)
+    center_lon, center_lat = to_centers(q, r, size)
+
+    # 칸 중심은 다시 같은 칸으로 돌아갑니다.
+    back_q, back_r = to_cells(center_lon, center_lat, size)
+    np.testing.assert_array_equal(back_q, q)
+    np.testing.assert_array_equal(back_r, r)
+    # 지점은 꼭짓점 거리(size) 안에 있고, 이웃한 어느 칸의 중심보다 자기 칸 중심에 더 가깝습니다.
+    distance = np.hypot(lon - center_lon, lat - center_lat)
+    assert (distance <= size * (1 + 1e-9)).all()
+    for dq, dr in HEX_NEIGHBOURS:
+        other_lon, other_lat = to_centers(q + dq, r + dr, size)
+        assert (distance <= np.hypot(lon - other_lon, lat - other_lat) + 1e-9).all()
+
+
+def test_grid_cells_round_trip_through_centers():
+    rng = np.random.default_rng(1)
+    lon, lat = rng.uniform(-180, 180, 10_000), rng.uniform(-90, 90, 10_000)
+    to_cells, to_centers, _ = BINNERS["격자"]
+
+    i, j = to_cells(lon, lat, 2.5)
+    center_lon, center_lat = to_centers(i, j, 2.5)
+
+    back_i, back_j = to_cells(center_lon, center_lat, 2.5)
+    np.testing.assert_array_equal(back_i, i)
+    np.testing.assert_array_equal(back_j, j)
+    assert (np.abs(lon - center_lon) <= 1.25).all() and (np.abs(lat - center_lat) <= 1.25).all()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pytest
+
+import aggregates
+import timeseries
+from aggregates import GLOBAL
+from ingest import PARTITIONING, write_partitioned
+from timeseries import lttb, minmax
+
+
+def _signal(n: int = 5000, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=np.int64) * 86_400_000_000_000
+    y = np.sin(np.linspace(0, 20, n)) * 50 + rng.normal(0, 5, n)
+    return x, y
+
+
+@pytest.mark.parametrize("n_out", [3, 10, 700])
+def test_lttb_keeps_endpoints_and_limits_points(n_out):
+    x, y = _signal()
+    picked = lttb(x, y, n_out)
+
+    assert len(picked) == n_out
+    assert picked[0] == 0 and picked[-1] == len(x) - 1
+    assert (np.diff(picked) > 0).all()
+
+
+def test_lttb_returns_everything_when_short():
+    x, y = _signal(50)
+    np.testing.assert_array_equal(lttb(x, y, 700), np.arange(50))
+
+
+@pytest.mark.parametrize("n_out", [2, 11, 700])
+def test_minmax_keeps_extremes_and_limits_points(n_out):
+    _, y = _signal()
+    y[1234], y[4321] = 1000.0, -1000.0
+    picked = minmax(y, n_out)
+
+    assert len(picked) <= n_out
+    assert (np.diff(picked) > 0).all()
+    assert {1234, 4321} <= set(picked.tolist())
+    # 버킷마다 최솟값/최댓값이 남으므로 전체 범위도 그대로입니다.
+    assert y[picked].min() == y.min() and y[picked].max() == y.max()
+
+
+def test_minmax_returns_everything_when_short():
+    _, y = _signal(30)
+    np.testing.assert_array_equal(minmax(y, 700), np.arange(30))
+
+
+@pytest.fixture
+def crw_frame(tmp_path, monkeypatch):
+    rng = np.random.default_rng(2)
+    frames = []
+    for country, start, periods in (("호주", "2015-12-20", 40), ("일본", "2016-01-05", 30)):
+        dates = pd.date_range(start, periods=periods, freq="D").repeat(3)  # 하루에 관측 지점 3개
+        values = rng.uniform(0, 100, size=(len(dates), 4)).astype(np.float32)
+        values[rng.random(values.shape) < 0.1] = np.nan
+        frames.append(pd.DataFrame({
+            "date": dates,
+            "country": country,
+            "sst": values[:, 0],
+            "ssta": values[:, 1],
+            "dhw": values[:, 2],
+            "bleaching_index": values[:, 3],
+            "year": dates.year.astype("int16"),
+        }))
+    frame = pd.concat(frames, ignore_index=True)
+    write_partitioned(frame, tmp_path)
+    monkeypatch.setattr(aggregates, "open_crw_dataset", lambda version: ds.dataset(tmp_path, format="parquet", partitioning=PARTITIONING))
+    aggregates.load_daily_index.clear()
+    timeseries._daily_arrays.clear()
+    yield frame
+    aggregates.load_daily_index.clear()
+    timeseries._daily_arrays.clear()
+
+
+@pytest.mark.parametrize("country", [GLOBAL, "호주", "일본"])
+def test_crw_daily_series_matches_pandas_groupby(crw_frame, country):
+    rows = crw_frame if country == GLOBAL else crw_frame[crw_frame["country"] == country]
+    expected = rows.groupby("date")["bleaching_index"].mean().dropna()
+
+    dates, series = timeseries._daily_arrays("crw-test", country)
+
+    assert not series.flags.writeable
+    valid = ~np.isnan(series)
+    np.testing.assert_array_equal(dates[valid], expected.index.to_numpy())
+    np.testing.assert_allclose(series[valid], expected.to_numpy(), rtol=1e-6)
+
+
+def test_query_series_stays_under_max_points(crw_frame):
+    frame = timeseries.query_series("crw-test", GLOBAL, "일별", pd.Timestamp("2015-12-01").date(), pd.Timestamp("2016-03-01").date(), max_points=20)
+    assert 0 < len(frame) <= 20
+    assert frame["백화현상지수"].notna().all()
@@ -0,0 +1,103 @@
+"""
+일별/월별 추세 시계열 조회와 다운샘플링
+- 선택한 표시 구간만 원해상도로 잘라낸 뒤, 차트 폭에 맞춰 LTTB 또는 최소/최대 버킷으로 점 수를 줄입니다.
+- 브라우저로는 항상 max_points 이하의 점만 전달됩니다.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import perf
+from aggregates import load_daily_index
+from data_layer import CACHE_MAX_ENTRIES, COUNTRIES
+
+RESOLUTIONS = ["연도별", "월별", "일별"]
+
+# 두 칼럼 레이아웃에서 추세 차트의 대략적인 폭(px). 한 픽셀에 한 점 이상은 보이지 않습니다.
+TREND_CHART_PX = 700
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: 모양을 보존하는 n_out 개 점의 인덱스를 반환합니다."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # 첫/마지막 점을 제외한 구간을 n_out - 2 개 버킷으로 나눕니다.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+def minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """버킷마다 최솟값/최댓값 점만 남긴 인덱스를 (원래 순서로) 반환합니다."""
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+
+    bucket = np.arange(n) * n_buckets // n
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+DOWNSAMPLERS = {
+    "LTTB": lambda x, y, n_out: lttb(x, y, n_out),
+    "최소/최대": lambda x, y, n_out: minmax(y, n_out),
+}
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES * len(COUNTRIES), show_spinner=False)
+def _daily_arrays(version: str, country: str) -> tuple[np.ndarray, np.ndarray]:
+    """국가(또는 전 지구)의 일별 (날짜[ns], 지수) 배열. 날짜 오름차순, 읽기 전용."""
+    perf.cache_miss("daily_arrays")
+    index = load_daily_index(version)
+    dates = index.days.astype("datetime64[ns]")
+    series = index.series("bleaching_index", country).astype(np.float32)
+    dates.flags.writeable = False
+    series.flags.writeable = False
+    return dates, series
+
+
+def query_series(
+    version: str,
+    country: str,
+    resolution: str,
+    start: datetime.date,
+    end: datetime.date,
+    max_points: int = TREND_CHART_PX,
+    method: str = "LTTB",
+) -> pd.DataFrame:
+    """표시 구간 [start, end] 의 (날짜, 백화현상지수) 를 해상도에 맞춰 집계하고 max_points 이하로 줄입니다."""
+    dates, series = _daily_arrays(version, country)
+    lo = dates.searchsorted(np.datetime64(start, "ns"))
+    hi = dates.searchsorted(np.datetime64(end, "ns"), side="right")
+    dates, series = dates[lo:hi], series[lo:hi]
+    perf.count("rows.trend_window", hi - lo)
+
+    if resolution == "월별":
+        monthly = pd.Series(series, index=dates).resample("ME").mean().dropna()
+        dates, series = monthly.index.to_numpy(), monthly.to_numpy()
+
+    valid = ~np.isnan(series)
+    dates, series = dates[valid], series[valid]
+    picked = DOWNSAMPLERS[method](dates.view(np.int64), series, max_points)
+    return pd.DataFrame({"날짜": dates[picked], "백화현상지수": series[picked]})